@@ -0,0 +1,62 @@
+"""Persistent TTL cache for API responses, backed by SQLite."""
+
+from __future__ import annotations
+
+import json
+import logging
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DAY = 24 * 60 * 60
+
+
+class ResponseCache:
+    """Key → JSON value store in one SQLite table; entries expire after `ttl` seconds.
+
+    Each call opens its own short-lived connection, so a single instance can be
+    shared by worker threads. Storage errors are logged and treated as misses —
+    the cache never makes a lookup fail.
+    """
+
+    def __init__(self, path: str | Path, table: str, ttl: float):
+        self.path = Path(path)
+        self.table = table
+        self.ttl = ttl
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, fetched_at REAL, json TEXT)"
+            )
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def get(self, key: str) -> Any | None:
+        """Return the cached value for `key`, or None if missing or expired."""
+        try:
+            with closing(self._connect()) as conn:
+                row = conn.execute(
+                    f"SELECT fetched_at, json FROM {self.table} WHERE key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug("Cache read failed (%s): %s", self.table, e)
+            return None
+        if row is None or time.time() - row[0] >= self.ttl:
+            return None
+        return json.loads(row[1])
+
+    def set(self, key: str, value: Any) -> None:
+        try:
+            with closing(self._connect()) as conn, conn:
+                conn.execute(
+                    f"INSERT OR REPLACE INTO {self.table} VALUES (?, ?, ?)",
+                    (key, time.time(), json.dumps(value)),
+                )
+        except sqlite3.Error as e:
+            logger.debug("Cache write failed (%s): %s", self.table, e)
@@ -2,19 +2,31 @@
 
 from __future__ import annotations
 
+import json
 import logging
 
 import httpx
+import orjson
+
+from src.cache import DAY, ResponseCache
+from src.http_client import make_client
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
 
+_CLIENT = make_client()
+
+# Drive times shift with traffic patterns, so refresh them more often than property data
+COMMUTE_CACHE_TTL = 7 * DAY
+
 
 def get_commute_times(
     origin: str,
     destinations: dict[str, str],
     api_key: str,
+    client: httpx.Client | None = None,
+    cache: ResponseCache | None = None,
 ) -> dict[str, int]:
     """Look up drive times from origin to multiple destinations in one API call.
 
@@ -22,6 +34,8 @@ def get_commute_times(
         origin: Property address or "lat,lng" string.
         destinations: Mapping of label to address, e.g. {"Work": "123 Office St"}.
         api_key: Google Maps API key.
+        client: HTTP client to use; defaults to the module's pooled client.
+        cache: Optional response cache keyed by origin + destination set.
 
     Returns:
         Dict of {label: minutes}, omitting destinations that failed.
@@ -30,11 +44,18 @@ def get_commute_times(
     if not destinations:
         return {}
 
+    cache_key = json.dumps([origin, sorted(destinations.items())])
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Commute cache hit for %s", origin)
+            return cached
+
     labels = list(destinations.keys())
     dest_string = "|".join(destinations.values())
 
     try:
-        resp = httpx.get(
+        resp = (client or _CLIENT).get(
             BASE_URL,
             params={
                 "origins": origin,
@@ -43,10 +64,9 @@ def get_commute_times(
                 "mode": "driving",
                 "departure_time": "now",
             },
-            timeout=15.0,
         )
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
 
         if data.get("status") != "OK":
             logger.warning("Distance Matrix API status: %s", data.get("status"))
@@ -64,6 +84,9 @@ def get_commute_times(
                     "Commute to %s failed: %s", label, element.get("status")
                 )
 
+        # Only cache complete answers so a transient per-destination failure is retried
+        if cache is not None and len(results) == len(labels):
+            cache.set(cache_key, results)
         return results
 
     except httpx.HTTPStatusError as e:
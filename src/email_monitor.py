@@ -6,10 +6,13 @@ import email
 import imaplib
 import logging
 import re
+from collections.abc import Iterator
 from dataclasses import dataclass
 from email.message import Message
+from email.parser import BytesHeaderParser
+from io import BytesIO
 
-from bs4 import BeautifulSoup
+from lxml import etree
 
 logger = logging.getLogger(__name__)
 
@@ -24,8 +27,43 @@ ZPID_TARGET_PATTERN = re.compile(
     re.IGNORECASE,
 )
 
+# Listing blocks: liked-homes/open-house emails use "mw502", new-listing emails "mw504"
+_LISTING_TABLE_CLASS_RE = re.compile(r"mw50[24]")
+# Same tables matched by whole class token (like CSS "table.mw502, table.mw504")
+_LISTING_TABLE_CLASSES = frozenset({"mw502", "mw504"})
 
-@dataclass
+# A line like "123 Main St, City, ST" or "123 Main St, City, ST 12345".
+# Searched over a whole block's text at once; [^\S\n] keeps a match on one line.
+_ADDR_LINE_RE = re.compile(
+    r"^[^\S\n]*(\d+[^\S\n]+\w+.*,[^\S\n]*\w+.*,[^\S\n]*[A-Z]{2}.*)$",
+    re.MULTILINE,
+)
+
+# Visible text nodes under an element: no comments, no <style>/<script> contents
+_TEXT_NODES = etree.XPath(".//text()[not(ancestor::style or ancestor::script)]")
+
+# Address slug in a homedetails URL, e.g. ".../homedetails/123-Main-St-City-ST/1_zpid"
+_URL_SLUG_RE = re.compile(r"/homedetails/([^/]+)/\d+_zpid")
+
+# Max message IDs per FETCH/STORE command. Batching saves a round-trip per
+# email; chunking keeps the command line under server request-size limits.
+FETCH_BATCH_SIZE = 100
+
+# FETCH response envelopes, e.g. b'12 (BODY[2.MIME] {310}' or b' BODY[2] {48211}'
+_FETCH_HEAD_RE = re.compile(rb"(\d+) \(")
+_FETCH_SECTION_RE = re.compile(rb"BODY\[([^\]]*)\]", re.IGNORECASE)
+
+# A text/html MIME part in raw RFC822 bytes: boundary line, part headers, body
+# up to the next occurrence of the same boundary
+_HTML_PART_RE = re.compile(
+    rb"^(--[^\r\n]+)\r?\n"
+    rb"((?:[^\r\n]+\r?\n)*?Content-Type:[ \t]*text/html[^\r\n]*\r?\n(?:[^\r\n]+\r?\n)*)"
+    rb"\r?\n(.*?)\r?\n\1",
+    re.DOTALL | re.IGNORECASE | re.MULTILINE,
+)
+
+
+@dataclass(slots=True)
 class ListingLink:
     url: str
     zpid: str
@@ -59,28 +97,30 @@ def _extract_listing_data_from_html(html: str, subject: str = "") -> list[Listin
             logger.debug("Truncated email HTML at %r", marker)
             break
 
-    soup = BeautifulSoup(parse_html, "lxml")
     links: list[ListingLink] = []
     seen_zpids: set[str] = set()
 
     # Strategy 1: Parse structured listing blocks from Zillow alert emails.
     # Liked-homes/open-house emails use "mw502", new-listing emails use "mw504".
-    for table in soup.find_all("table", class_=re.compile(r"mw50[24]")):
+    # Skip building a DOM at all when the raw HTML has no such tables.
+    tables = _iter_listing_tables(parse_html) if _LISTING_TABLE_CLASS_RE.search(parse_html) else ()
+
+    for table in tables:
         # Find the ZPID. Zillow wraps <a> hrefs in click-tracking redirects
         # (click.mail.zillow.com), so the real URLs only appear in VML markup
-        # that BeautifulSoup can't parse as tags. Search the raw HTML instead.
+        # inside conditional comments. Search hrefs, comments, then the rest.
         zpid = None
         url = None
-        block_html = str(table)
+        link_text = _block_link_text(table)
 
         # Try homedetails URL first (liked-homes/open-house emails)
-        match = ZILLOW_URL_PATTERN.search(block_html)
+        match = ZILLOW_URL_PATTERN.search(link_text)
         if match:
             zpid = match.group(1)
             url = match.group(0).rstrip("/") + "/"
         else:
             # Fall back to zpid_target URL (new-listing emails)
-            match = ZPID_TARGET_PATTERN.search(block_html)
+            match = ZPID_TARGET_PATTERN.search(link_text)
             if match:
                 zpid = match.group(1)
                 url = f"https://www.zillow.com/homedetails/{zpid}_zpid/"
@@ -97,38 +137,81 @@ def _extract_listing_data_from_html(html: str, subject: str = "") -> list[Listin
         seen_zpids.add(zpid)
         links.append(ListingLink(url=url, zpid=zpid, address=address, price=price))
 
-    # Strategy 2: If no structured blocks found, fall back to scanning all links
-    # and trying to find nearby address text.
+    # Strategy 2: If no structured blocks found, fall back to scanning the raw
+    # HTML for listing URLs and deriving addresses from their slugs.
     if not links:
-        links = _extract_urls_with_address_fallback(soup, html, seen_zpids)
+        links = _extract_urls_with_address_fallback(html, seen_zpids)
 
     return links
 
 
-def _extract_address_from_block(block: BeautifulSoup) -> str:
+def _is_listing_table(elem: etree._Element) -> bool:
+    return not _LISTING_TABLE_CLASSES.isdisjoint((elem.get("class") or "").split())
+
+
+def _block_link_text(table: etree._Element) -> str:
+    """Join the parts of a listing table that can carry listing URLs.
+
+    Hrefs come first so they win over any other match, then the text of every
+    comment (Outlook VML blocks live in conditional comments), then every other
+    attribute value (data-href, src, ...) and the visible text.
+    """
+    return "\n".join([
+        *table.xpath(".//@href"),
+        *(c.text or "" for c in table.iter(etree.Comment)),
+        *table.xpath(".//@*[name() != 'href'] | .//text()"),
+    ])
+
+
+def _iter_listing_tables(html: str) -> Iterator[etree._Element]:
+    """Stream listing tables out of email HTML in document order.
+
+    Uses lxml's iterparse so the full DOM is never held: every table that
+    isn't inside a listing table is cleared (with its earlier siblings) once
+    it has been handled. Nested listing tables are yielded right after their
+    enclosing listing table, matching document order.
+    """
+    events = etree.iterparse(
+        BytesIO(html.encode("utf-8")), events=("end",), tag="table", html=True, encoding="utf-8",
+    )
+    try:
+        for _, elem in events:
+            if any(_is_listing_table(a) for a in elem.iterancestors("table")):
+                continue  # handled together with its enclosing listing table
+            if _is_listing_table(elem):
+                yield from (t for t in elem.iter("table") if _is_listing_table(t))
+            elem.clear()
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+    except etree.XMLSyntaxError as e:
+        logger.debug("Stopped parsing email HTML: %s", e)
+
+
+def _stripped_text(elem: etree._Element, separator: str) -> str:
+    """Join the element's visible text nodes, each stripped, skipping blanks."""
+    return separator.join(filter(None, (t.strip() for t in _TEXT_NODES(elem))))
+
+
+def _extract_address_from_block(block: etree._Element) -> str:
     """Extract a street address from a listing block element.
 
     Searches for text that looks like a US street address within the block.
     """
     # Common pattern: address is in a text node or <p>/<td>/<a> near the link
-    text = block.get_text(separator="\n", strip=True)
-    # Look for lines that resemble an address (number + street name + city/state)
-    for line in text.split("\n"):
-        line = line.strip()
-        # Match patterns like "123 Main St, City, ST" or "123 Main St, City, ST 12345"
-        if re.match(r"\d+\s+\w+.*,\s*\w+.*,\s*[A-Z]{2}", line):
-            return line
-    return ""
+    text = _stripped_text(block, "\n")
+    # First line that resembles an address (number + street name + city/state)
+    match = _ADDR_LINE_RE.search(text)
+    return match.group(1).strip() if match else ""
 
 
-def _extract_price_from_block(block: BeautifulSoup) -> int:
+def _extract_price_from_block(block: etree._Element) -> int:
     """Extract listing price from a listing block element.
 
     Zillow email alerts show the price in an <h5> tag like "$485,000".
     """
-    h5 = block.find("h5")
-    if h5:
-        text = h5.get_text(strip=True)
+    h5 = block.find(".//h5")
+    if h5 is not None:
+        text = _stripped_text(h5, "")
         # Strip "$" and "," to get a plain number
         cleaned = text.replace("$", "").replace(",", "")
         try:
@@ -143,7 +226,7 @@ def _address_from_url(url: str) -> str:
 
     e.g. ".../homedetails/123-Main-St-City-ST-12345/..." → "123 Main St City ST 12345"
     """
-    match = re.search(r"/homedetails/([^/]+)/\d+_zpid", url)
+    match = _URL_SLUG_RE.search(url)
     if match:
         slug = match.group(1)
         return slug.replace("-", " ")
@@ -151,24 +234,15 @@ def _address_from_url(url: str) -> str:
 
 
 def _extract_urls_with_address_fallback(
-    soup: BeautifulSoup, html: str, seen_zpids: set[str]
+    html: str, seen_zpids: set[str]
 ) -> list[ListingLink]:
-    """Fallback: extract URLs from all <a> tags and raw text, with best-effort address."""
-    links: list[ListingLink] = []
+    """Fallback: extract URLs from the raw HTML, with best-effort address.
 
-    # Check all <a> tags
-    for tag in soup.find_all("a", href=True):
-        href = tag["href"]
-        match = ZILLOW_URL_PATTERN.search(href)
-        if match:
-            zpid = match.group(1)
-            if zpid not in seen_zpids:
-                seen_zpids.add(zpid)
-                clean_url = match.group(0).rstrip("/") + "/"
-                address = _address_from_url(clean_url)
-                links.append(ListingLink(url=clean_url, zpid=zpid, address=address))
+    One linear regex scan covers <a> hrefs as well as URLs in text or VML
+    markup, so no DOM is built.
+    """
+    links: list[ListingLink] = []
 
-    # Also search raw text for URLs
     for match in ZILLOW_URL_PATTERN.finditer(html):
         zpid = match.group(1)
         if zpid not in seen_zpids:
@@ -180,34 +254,237 @@ def _extract_urls_with_address_fallback(
     return links
 
 
+def _decode_payload(part: Message) -> str:
+    """Decode a single (non-multipart) MIME part to text."""
+    payload = part.get_payload(decode=True)
+    if not payload:
+        return ""
+    charset = part.get_content_charset() or "utf-8"
+    return payload.decode(charset, errors="replace")
+
+
 def _get_html_body(msg: Message) -> str:
     """Extract the HTML body from an email message."""
     if msg.is_multipart():
         for part in msg.walk():
-            content_type = part.get_content_type()
-            if content_type == "text/html":
-                payload = part.get_payload(decode=True)
-                if payload:
-                    charset = part.get_content_charset() or "utf-8"
-                    return payload.decode(charset, errors="replace")
-    else:
-        if msg.get_content_type() == "text/html":
-            payload = msg.get_payload(decode=True)
-            if payload:
-                charset = msg.get_content_charset() or "utf-8"
-                return payload.decode(charset, errors="replace")
+            if part.get_content_type() == "text/html":
+                body = _decode_payload(part)
+                if body:
+                    return body
+    elif msg.get_content_type() == "text/html":
+        body = _decode_payload(msg)
+        if body:
+            return body
 
     # Fall back to plain text
     if msg.is_multipart():
         for part in msg.walk():
             if part.get_content_type() == "text/plain":
-                payload = part.get_payload(decode=True)
-                if payload:
-                    charset = part.get_content_charset() or "utf-8"
-                    return payload.decode(charset, errors="replace")
+                body = _decode_payload(part)
+                if body:
+                    return body
     return ""
 
 
+def _html_from_raw(raw: bytes) -> str | None:
+    """Decode the first text/html part straight out of raw message bytes.
+
+    Avoids building the full MIME tree; returns None when no HTML part is found
+    so the caller can fall back to `_get_html_body`.
+    """
+    match = _HTML_PART_RE.search(raw)
+    if not match:
+        return None
+    return _decode_payload(email.message_from_bytes(match.group(2) + b"\r\n" + match.group(3))) or None
+
+
+def _chunked(items: list[bytes], size: int) -> Iterator[list[bytes]]:
+    """Yield successive slices of at most `size` items."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _flatten_response(msg_data: list) -> bytes:
+    """Reassemble an imaplib FETCH response (with literals) into raw protocol bytes."""
+    buf = bytearray()
+    for item in msg_data:
+        if isinstance(item, tuple):
+            buf += item[0] + b"\r\n" + item[1]
+        elif item:
+            buf += item
+    return bytes(buf)
+
+
+def _parse_sexp(data: bytes) -> list:
+    """Parse IMAP parenthesized data into nested lists of bytes (NIL → None).
+
+    Handles quoted strings and {n} literals. Raises ValueError/IndexError on
+    malformed input.
+    """
+    stack: list[list] = [[]]
+    i, n = 0, len(data)
+    while i < n:
+        c = data[i]
+        if c in b" \r\n":
+            i += 1
+        elif c == ord("("):
+            stack.append([])
+            i += 1
+        elif c == ord(")"):
+            done = stack.pop()
+            stack[-1].append(done)
+            i += 1
+        elif c == ord('"'):
+            buf = bytearray()
+            i += 1
+            while data[i] != ord('"'):
+                if data[i] == ord("\\"):
+                    i += 1
+                buf.append(data[i])
+                i += 1
+            stack[-1].append(bytes(buf))
+            i += 1
+        elif c == ord("{"):
+            close = data.index(b"}", i)
+            size = int(data[i + 1:close])
+            start = data.index(b"\n", close) + 1
+            stack[-1].append(data[start:start + size])
+            i = start + size
+        else:
+            j = i
+            while j < n and data[j] not in b' ()"\r\n':
+                j += 1
+            atom = data[i:j]
+            stack[-1].append(None if atom.upper() == b"NIL" else atom)
+            i = j
+    if len(stack) != 1:
+        raise ValueError("unbalanced parentheses in IMAP response")
+    return stack[0]
+
+
+def _find_html_section(structure: list, prefix: str = "") -> str | None:
+    """Return the IMAP section number of the first text/html part, e.g. "2" or "1.2".
+
+    Returns "" when the message itself is a single text/html part, None if
+    there is no HTML part at all.
+    """
+    if structure and isinstance(structure[0], list):
+        # multipart: child parts come first, followed by the subtype string
+        for num, child in enumerate(structure, 1):
+            if not isinstance(child, list):
+                break
+            section = _find_html_section(child, f"{prefix}{num}.")
+            if section is not None:
+                return section
+        return None
+    if (
+        len(structure) >= 2
+        and isinstance(structure[0], bytes)
+        and isinstance(structure[1], bytes)
+        and structure[0].lower() == b"text"
+        and structure[1].lower() == b"html"
+    ):
+        return prefix[:-1]
+    return None
+
+
+def _html_sections(imap: imaplib.IMAP4_SSL, msg_ids: list[bytes]) -> dict[bytes, str | None]:
+    """Locate the text/html section of each message via one BODYSTRUCTURE fetch.
+
+    Messages whose structure can't be parsed map to None (fetch whole message).
+    """
+    sections: dict[bytes, str | None] = dict.fromkeys(msg_ids)
+    status, msg_data = imap.fetch(b",".join(msg_ids), "(BODYSTRUCTURE)")
+    if status != "OK":
+        return sections
+    try:
+        tokens = _parse_sexp(_flatten_response(msg_data))
+    except (ValueError, IndexError):
+        logger.debug("Could not parse BODYSTRUCTURE response; fetching full messages")
+        return sections
+
+    # Response is a flat sequence of: <msg_id> (BODYSTRUCTURE (...)) ...
+    for msg_id, attrs in zip(tokens, tokens[1:]):
+        if not isinstance(msg_id, bytes) or msg_id not in sections or not isinstance(attrs, list):
+            continue
+        for key, value in zip(attrs, attrs[1:]):
+            if key == b"BODYSTRUCTURE" and isinstance(value, list):
+                sections[msg_id] = _find_html_section(value)
+    return sections
+
+
+def _iter_fetched_parts(msg_data: list) -> Iterator[tuple[bytes, dict[str, bytes]]]:
+    """Yield (msg_id, {section: payload}) from a multi-message FETCH response.
+
+    imaplib returns one (envelope, literal) tuple per requested body section,
+    interleaved with b")" terminators and any unsolicited untagged responses —
+    only the tuples carry message data.
+    """
+    msg_id = b""
+    parts: dict[str, bytes] = {}
+    for item in msg_data:
+        if not isinstance(item, tuple):
+            continue
+        head, payload = item
+        match = _FETCH_HEAD_RE.match(head)
+        if match:
+            if parts:
+                yield msg_id, parts
+            msg_id, parts = match.group(1), {}
+        sections = _FETCH_SECTION_RE.findall(head)
+        if sections and msg_id:
+            section = sections[-1].decode().upper()
+            if section.startswith("HEADER.FIELDS"):
+                section = "HEADER.FIELDS"
+            parts[section] = payload
+    if parts:
+        yield msg_id, parts
+
+
+def _fetch_html_bodies(
+    imap: imaplib.IMAP4_SSL, msg_ids: list[bytes]
+) -> Iterator[tuple[bytes, str, str]]:
+    """Yield (msg_id, subject, html) for each message, fetching only the HTML part.
+
+    Messages sharing the same HTML section number are fetched together in one
+    command. BODY.PEEK leaves the \\Seen flag alone; callers STORE it explicitly.
+    """
+    groups: dict[str | None, list[bytes]] = {}
+    for msg_id, section in _html_sections(imap, msg_ids).items():
+        groups.setdefault(section, []).append(msg_id)
+
+    for section, ids in groups.items():
+        if section is None:
+            spec = "(BODY.PEEK[])"
+        elif section == "":
+            spec = "(BODY.PEEK[HEADER] BODY.PEEK[TEXT])"
+        else:
+            spec = f"(BODY.PEEK[HEADER.FIELDS (SUBJECT)] BODY.PEEK[{section}.MIME] BODY.PEEK[{section}])"
+
+        status, msg_data = imap.fetch(b",".join(ids), spec)
+        if status != "OK":
+            logger.warning("IMAP fetch failed for %d message(s)", len(ids))
+            continue
+
+        for msg_id, parts in _iter_fetched_parts(msg_data):
+            if section is None:
+                raw = parts.get("", b"")
+                headers = BytesHeaderParser().parsebytes(raw)
+                html = _html_from_raw(raw)
+                if html is None:
+                    html = _get_html_body(email.message_from_bytes(raw))
+                yield msg_id, headers.get("Subject", "(no subject)"), html
+            elif section == "":
+                msg = email.message_from_bytes(parts.get("HEADER", b"") + parts.get("TEXT", b""))
+                yield msg_id, msg.get("Subject", "(no subject)"), _decode_payload(msg)
+            else:
+                headers = email.message_from_bytes(parts.get("HEADER.FIELDS", b""))
+                part = email.message_from_bytes(
+                    parts.get(f"{section}.MIME", b"") + parts.get(section, b"")
+                )
+                yield msg_id, headers.get("Subject", "(no subject)"), _decode_payload(part)
+
+
 def fetch_new_listing_urls(
     imap: imaplib.IMAP4_SSL,
     mark_read: bool = True,
@@ -230,30 +507,25 @@ def fetch_new_listing_urls(
     all_links: list[ListingLink] = []
     seen_zpids: set[str] = set()
 
-    for msg_id in msg_ids:
-        status, msg_data = imap.fetch(msg_id, "(RFC822)")
-        if status != "OK" or not msg_data[0]:
-            continue
-
-        raw_email = msg_data[0][1]
-        msg = email.message_from_bytes(raw_email)
-        subject = msg.get("Subject", "(no subject)")
-        logger.info("Processing email: %s", subject)
-        html_body = _get_html_body(msg)
-
-        if not html_body:
-            logger.debug("No HTML body in email %s", msg_id)
-            continue
-
-        links = _extract_listing_data_from_html(html_body, subject=subject)
-        for link in links:
-            if link.zpid not in seen_zpids:
-                seen_zpids.add(link.zpid)
-                all_links.append(link)
-
-        # Mark as read so we don't reprocess
-        if mark_read:
-            imap.store(msg_id, "+FLAGS", "\\Seen")
+    for chunk in _chunked(msg_ids, FETCH_BATCH_SIZE):
+        processed: list[bytes] = []
+        for msg_id, subject, html_body in _fetch_html_bodies(imap, chunk):
+            logger.info("Processing email: %s", subject)
+
+            if not html_body:
+                logger.debug("No HTML body in email %s", msg_id)
+                continue
+
+            links = _extract_listing_data_from_html(html_body, subject=subject)
+            for link in links:
+                if link.zpid not in seen_zpids:
+                    seen_zpids.add(link.zpid)
+                    all_links.append(link)
+            processed.append(msg_id)
+
+        # Mark as read so we don't reprocess — one STORE for the whole chunk
+        if mark_read and processed:
+            imap.store(b",".join(processed), "+FLAGS", "\\Seen")
 
     logger.info("Extracted %d unique listing(s) from emails", len(all_links))
     return all_links
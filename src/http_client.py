@@ -0,0 +1,24 @@
+"""Shared httpx client setup for the external API clients."""
+
+from __future__ import annotations
+
+import atexit
+import importlib.util
+
+import httpx
+
+
+def make_client(timeout: float = 15.0) -> httpx.Client:
+    """Return a pooled client that is closed at interpreter exit.
+
+    Each API module keeps one client per host and reuses it for every lookup
+    in a run, so the TCP+TLS handshake is paid once. HTTP/2 needs the
+    optional h2 package (httpx[http2]).
+    """
+    client = httpx.Client(
+        http2=importlib.util.find_spec("h2") is not None,
+        timeout=timeout,
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=40, keepalive_expiry=30),
+    )
+    atexit.register(client.close)
+    return client
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import argparse
+import imaplib
 import json
 import logging
 import platform
@@ -9,28 +11,40 @@ import sys
 import time
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from logging.handlers import RotatingFileHandler
 from pathlib import Path
 
-import yaml
-
-from src.commute import get_commute_times
+from src.cache import ResponseCache
+from src.commute import COMMUTE_CACHE_TTL, get_commute_times
 from src.email_monitor import ListingLink, connect, disconnect, fetch_new_listing_urls
 from src.parser import Property, parse_from_rentcast
-from src.rentcast import lookup_property
-from src.scorer import ScoreBreakdown, load_scoring_config, score_property
+from src.rentcast import RENTCAST_CACHE_TTL, lookup_property
+from src.scorer import (
+    ScoreBreakdown,
+    compile_scoring_config,
+    load_scoring_config,
+    load_yaml,
+    score_properties,
+)
 from src.sheets import SheetsClient
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 
+# Concurrent RentCast / Distance Matrix requests per run
+LOOKUP_WORKERS = 8
+
+# Daemon mode: default minutes between runs, and seconds between IMAP NOOPs
+DEFAULT_INTERVAL_MINUTES = 60
+IMAP_KEEPALIVE_SECONDS = 5 * 60
+
 
 def _load_config() -> dict:
     config_path = PROJECT_ROOT / "config" / "config.yaml"
     if not config_path.exists():
         print(f"ERROR: {config_path} not found. Copy config.yaml.example and fill in values.")
         sys.exit(1)
-    with open(config_path) as f:
-        return yaml.safe_load(f)
+    return load_yaml(config_path)
 
 
 def _setup_logging(log_file: str | None) -> None:
@@ -62,30 +76,171 @@ def _setup_logging(log_file: str | None) -> None:
         root.addHandler(file_handler)
 
 
-def run() -> None:
-    run_id = uuid.uuid4().hex[:8]
-    t_start = time.monotonic()
+class _Connections:
+    """Sheets and Gmail connections, opened on first use and reused across runs."""
+
+    def __init__(self, config: dict, logger: logging.Logger):
+        self.config = config
+        self.logger = logger
+        self._sheets: SheetsClient | None = None
+        self._imap: imaplib.IMAP4_SSL | None = None
 
+    def sheets(self) -> SheetsClient:
+        if self._sheets is None:
+            sheets_cfg = self.config["google_sheets"]
+            self.logger.info("Connecting to Google Sheet %s", sheets_cfg["spreadsheet_id"])
+            self._sheets = SheetsClient(
+                credentials_file=PROJECT_ROOT / sheets_cfg["credentials_file"],
+                spreadsheet_id=sheets_cfg["spreadsheet_id"],
+                marker_dir=PROJECT_ROOT / "data",
+            )
+        return self._sheets
+
+    def imap(self) -> imaplib.IMAP4_SSL:
+        self.keepalive()
+        if self._imap is None:
+            gmail_cfg = self.config["gmail"]
+            self.logger.info("Connecting to Gmail as %s", gmail_cfg["email"])
+            self._imap = connect(gmail_cfg["email"], gmail_cfg["app_password"])
+        return self._imap
+
+    def keepalive(self) -> None:
+        """NOOP the open IMAP connection; drop it if the server has hung up."""
+        if self._imap is None:
+            return
+        try:
+            self._imap.noop()
+        except (imaplib.IMAP4.error, OSError) as e:
+            self.logger.info("IMAP connection lost (%s), will reconnect", e)
+            self.drop_imap()
+
+    def drop_imap(self) -> None:
+        if self._imap is not None:
+            disconnect(self._imap)
+            self._imap = None
+            self.logger.debug("IMAP connection closed")
+
+    def reset(self) -> None:
+        """Forget every connection so the next run starts fresh."""
+        self.drop_imap()
+        self._sheets = None
+
+
+def run(daemon: bool = False, interval_minutes: float = DEFAULT_INTERVAL_MINUTES) -> None:
+    """Run the pipeline once, or every `interval_minutes` when `daemon` is set.
+
+    In daemon mode the Sheets and Gmail connections stay open between runs
+    (with periodic IMAP NOOPs) instead of being re-established each time.
+    """
     config = _load_config()
     _setup_logging(config.get("pipeline", {}).get("log_file"))
 
     logger = logging.getLogger("realtor")
+    conns = _Connections(config, logger)
+    try:
+        while True:
+            _run_once(config, logger, conns)
+            if not daemon:
+                break
+            logger.info("Next run in %g minute(s)", interval_minutes)
+            deadline = time.monotonic() + interval_minutes * 60
+            while (remaining := deadline - time.monotonic()) > 0:
+                time.sleep(min(remaining, IMAP_KEEPALIVE_SECONDS))
+                conns.keepalive()
+    except KeyboardInterrupt:
+        logger.info("Interrupted, shutting down")
+    finally:
+        conns.drop_imap()
+
+
+def _run_once(config: dict, logger: logging.Logger, conns: _Connections) -> None:
+    run_id = uuid.uuid4().hex[:8]
+    t_start = time.monotonic()
+
     logger.info(
         "=== Pipeline run %s starting | Python %s | %s ===",
         run_id, platform.python_version(), platform.node(),
     )
 
     try:
-        _run_pipeline(config, logger, run_id)
+        _run_pipeline(config, logger, run_id, conns)
     except Exception:
         logger.critical("Unhandled exception in pipeline run %s:\n%s", run_id, traceback.format_exc())
+        conns.reset()
     finally:
         elapsed = time.monotonic() - t_start
         logger.info("=== Pipeline run %s finished in %.1fs ===\n", run_id, elapsed)
 
 
-def _run_pipeline(config: dict, logger: logging.Logger, run_id: str) -> None:
-    scoring_config = load_scoring_config(PROJECT_ROOT / "config" / "scoring.yaml")
+def _enrich_listing(
+    link: ListingLink,
+    step: str,
+    dump_dir: Path,
+    rentcast_key: str,
+    destinations: dict[str, str],
+    gmaps_key: str,
+    rentcast_cache: ResponseCache,
+    commute_cache: ResponseCache,
+    logger: logging.Logger,
+) -> Property | None:
+    """Look up, parse, and add commute times for one listing. None on failure.
+
+    Runs on a worker thread — does no Sheets I/O.
+    """
+    logger.info("%s Processing ZPID %s — %s", step, link.zpid, link.address or link.url)
+
+    address = link.address
+    if not address:
+        logger.warning("%s  No address extracted, skipping", step)
+        return None
+
+    # Check for cached API response before hitting RentCast
+    dump_path = dump_dir / f"{link.zpid}.json"
+
+    if dump_path.exists():
+        logger.info("%s  Using cached RentCast data from %s", step, dump_path)
+        with open(dump_path) as f:
+            property_data = json.load(f)
+    else:
+        logger.info("%s  Looking up: %s", step, address)
+        property_data = lookup_property(address, rentcast_key, cache=rentcast_cache)
+        if not property_data:
+            logger.warning("%s  RentCast lookup failed", step)
+            return None
+
+        with open(dump_path, "w") as f:
+            json.dump(property_data, f, indent=2)
+        logger.debug("%s  Saved raw response to %s", step, dump_path)
+
+    # Parse into Property
+    try:
+        prop = parse_from_rentcast(property_data, link.zpid, link.url, link.price)
+    except Exception:
+        logger.error("%s  Parse exception:\n%s", step, traceback.format_exc())
+        return None
+
+    # Look up commute times
+    if destinations and prop.address:
+        commutes = get_commute_times(prop.address, destinations, gmaps_key, cache=commute_cache)
+        if commutes:
+            prop.commute_minutes = commutes
+            logger.info("%s  Commutes: %s", step, commutes)
+
+    logger.info(
+        "%s  %s | $%s | %dbd/%sbr | %s sqft | %.1f acres",
+        step, prop.address, f"{prop.price:,}",
+        prop.bedrooms, prop.bathrooms,
+        f"{prop.sqft:,}", prop.lot_size_acres,
+    )
+    return prop
+
+
+def _run_pipeline(
+    config: dict, logger: logging.Logger, run_id: str, conns: _Connections,
+) -> None:
+    scoring_config = compile_scoring_config(
+        load_scoring_config(PROJECT_ROOT / "config" / "scoring.yaml")
+    )
     max_per_run = config.get("pipeline", {}).get("max_listings_per_run", 20)
 
     # RentCast API key
@@ -110,38 +265,46 @@ def _run_pipeline(config: dict, logger: logging.Logger, run_id: str) -> None:
     else:
         logger.warning("No google_maps config — commute times will not be looked up")
 
+    # Persistent API response caches (RentCast records, drive times)
+    cache_path = PROJECT_ROOT / "data" / "api_cache.sqlite"
+    rentcast_cache = ResponseCache(cache_path, "rentcast", RENTCAST_CACHE_TTL)
+    commute_cache = ResponseCache(cache_path, "commute", COMMUTE_CACHE_TTL)
+
     # --- 1. Connect to Google Sheets (our database of record) ---
-    sheets_cfg = config["google_sheets"]
-    logger.info("Connecting to Google Sheet %s", sheets_cfg["spreadsheet_id"])
     try:
-        sheets = SheetsClient(
-            credentials_file=PROJECT_ROOT / sheets_cfg["credentials_file"],
-            spreadsheet_id=sheets_cfg["spreadsheet_id"],
-        )
+        sheets = conns.sheets()
     except Exception:
         logger.error("Failed to connect to Google Sheets:\n%s", traceback.format_exc())
         return
 
-    existing_zpids = sheets.get_existing_zpids()
-    logger.info("Listings tab has %d existing ZPIDs", len(existing_zpids))
-
     # --- 2. Fetch listing data from email ---
-    gmail_cfg = config["gmail"]
-    logger.info("Connecting to Gmail as %s", gmail_cfg["email"])
-    try:
-        imap = connect(gmail_cfg["email"], gmail_cfg["app_password"])
-    except Exception:
-        logger.error("Failed to connect to Gmail:\n%s", traceback.format_exc())
-        return
+    # Re-read rather than trust the client's cache: the sheet may have been
+    # edited by hand since the last run (daemon mode reuses the client).
+    # The Listings tab lookup + ZPID read runs in the background while IMAP
+    # logs in. It must succeed before the fetch, which marks emails read: a
+    # run that can't reach the tab has to leave the mailbox untouched.
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        zpids_future = pool.submit(sheets.refresh_zpid_cache)
+
+        try:
+            imap = conns.imap()
+        except Exception:
+            logger.error("Failed to connect to Gmail:\n%s", traceback.format_exc())
+            return
+
+        try:
+            existing_zpids = zpids_future.result()
+        except Exception:
+            logger.error("Failed to open the Listings tab:\n%s", traceback.format_exc())
+            return
+    logger.info("Listings tab has %d existing ZPIDs", len(existing_zpids))
 
     try:
         links: list[ListingLink] = fetch_new_listing_urls(imap)
     except Exception:
         logger.error("Failed to fetch emails:\n%s", traceback.format_exc())
+        conns.drop_imap()
         return
-    finally:
-        disconnect(imap)
-        logger.debug("IMAP connection closed")
 
     # --- 3. Filter to only new listings, then look up via RentCast ---
     # Dedup against our sheet BEFORE making any API calls
@@ -161,68 +324,42 @@ def _run_pipeline(config: dict, logger: logging.Logger, run_id: str) -> None:
             "%d new listing(s) to look up (%d API call(s))",
             len(to_process), len(to_process),
         )
-        for i, link in enumerate(to_process):
-            step = f"[{i + 1}/{len(to_process)}]"
-            logger.info("%s Processing ZPID %s — %s", step, link.zpid, link.address or link.url)
-
-            address = link.address
-            if not address:
-                logger.warning("%s  No address extracted, skipping", step)
-                failed += 1
-                continue
-
-            # Check for cached API response before hitting RentCast
-            dump_dir = PROJECT_ROOT / "data" / "rentcast"
-            dump_dir.mkdir(parents=True, exist_ok=True)
-            dump_path = dump_dir / f"{link.zpid}.json"
-
-            if dump_path.exists():
-                logger.info("%s  Using cached RentCast data from %s", step, dump_path)
-                with open(dump_path) as f:
-                    property_data = json.load(f)
-            else:
-                logger.info("%s  Looking up: %s", step, address)
-                property_data = lookup_property(address, rentcast_key)
-                if not property_data:
-                    logger.warning("%s  RentCast lookup failed", step)
+        # RentCast + commute lookups are independent network waits, so overlap
+        # them; new rows are buffered and written to Sheets in one call.
+        dump_dir = PROJECT_ROOT / "data" / "rentcast"
+        dump_dir.mkdir(parents=True, exist_ok=True)
+        new_props: list[Property] = []
+        with ThreadPoolExecutor(max_workers=LOOKUP_WORKERS) as pool:
+            futures = [
+                pool.submit(
+                    _enrich_listing, link, f"[{i + 1}/{len(to_process)}]",
+                    dump_dir, rentcast_key, destinations, gmaps_key,
+                    rentcast_cache, commute_cache, logger,
+                )
+                for i, link in enumerate(to_process)
+            ]
+            for future in futures:
+                prop = future.result()
+                if prop is None:
                     failed += 1
-                    continue
+                else:
+                    new_props.append(prop)
 
-                with open(dump_path, "w") as f:
-                    json.dump(property_data, f, indent=2)
-                logger.debug("%s  Saved raw response to %s", step, dump_path)
-
-            # Parse into Property
+        # Add raw data to Listings tab
+        if new_props:
             try:
-                prop = parse_from_rentcast(property_data, link.zpid, link.url, link.price)
+                # add_listings also drops ZPIDs that appeared in more than one email
+                stored = [p for p, ok in zip(new_props, sheets.add_listings(new_props)) if ok]
+                added += len(stored)
+                skipped_dup += len(new_props) - len(stored)
+                existing_zpids.update(p.zpid for p in stored)
+                logger.info("Stored %d listing(s) in Listings", len(stored))
             except Exception:
-                logger.error("%s  Parse exception:\n%s", step, traceback.format_exc())
-                failed += 1
-                continue
-
-            # Look up commute times
-            if destinations and prop.address:
-                commutes = get_commute_times(prop.address, destinations, gmaps_key)
-                if commutes:
-                    prop.commute_minutes = commutes
-                    logger.info("%s  Commutes: %s", step, commutes)
-
-            logger.info(
-                "%s  %s | $%s | %dbd/%sbr | %s sqft | %.1f acres",
-                step, prop.address, f"{prop.price:,}",
-                prop.bedrooms, prop.bathrooms,
-                f"{prop.sqft:,}", prop.lot_size_acres,
-            )
-
-            # Add raw data to Listings tab
-            try:
-                sheets.add_listing(prop)
-                added += 1
-                existing_zpids.add(link.zpid)
-                logger.info("%s  Stored in Listings", step)
-            except Exception:
-                logger.error("%s  Failed to write to Listings:\n%s", step, traceback.format_exc())
-                failed += 1
+                logger.error(
+                    "Failed to write %d listing(s) to Listings:\n%s",
+                    len(new_props), traceback.format_exc(),
+                )
+                failed += len(new_props)
 
         logger.info(
             "Lookup phase — Added: %d | Dup: %d | Failed: %d",
@@ -231,31 +368,34 @@ def _run_pipeline(config: dict, logger: logging.Logger, run_id: str) -> None:
 
     # --- 4. Re-score ALL listings and rebuild Scores tab ---
     logger.info("Re-scoring all listings with current scoring matrix")
-    all_properties = sheets.read_all_listings()
-    ignored = [p for p in all_properties if p.status.lower() == "ignore"]
-    all_properties = [p for p in all_properties if p.status.lower() != "ignore"]
-    if ignored:
-        logger.info("Skipped %d ignored listing(s)", len(ignored))
+    all_properties = sheets.read_all_listings(skip_statuses=("ignore",))
     logger.info("Read %d active listings from Listings tab", len(all_properties))
 
-    # Backfill commute data for existing listings missing it
+    # Backfill commute data for existing listings missing it, and persist it to
+    # the Listings tab so later runs don't look it up again
     if destinations:
-        backfilled = 0
-        for prop in all_properties:
-            if not prop.commute_minutes and prop.address:
-                commutes = get_commute_times(prop.address, destinations, gmaps_key)
+        backfilled: dict[str, dict[str, int]] = {}
+        missing = [p for p in all_properties if not p.commute_minutes and p.address]
+        with ThreadPoolExecutor(max_workers=LOOKUP_WORKERS) as pool:
+            results = pool.map(
+                lambda p: get_commute_times(p.address, destinations, gmaps_key, cache=commute_cache),
+                missing,
+            )
+            for prop, commutes in zip(missing, results):
                 if commutes:
                     prop.commute_minutes = commutes
-                    backfilled += 1
-                time.sleep(0.1)
+                    backfilled[prop.zpid] = commutes
         if backfilled:
-            logger.info("Backfilled commute data for %d listing(s)", backfilled)
+            logger.info("Backfilled commute data for %d listing(s)", len(backfilled))
+            try:
+                sheets.update_commutes(backfilled)
+            except Exception:
+                logger.error("Failed to save backfilled commutes:\n%s", traceback.format_exc())
 
     NEEDS_WORK_PENALTY = -40
 
     scored: list[tuple[Property, ScoreBreakdown]] = []
-    for prop in all_properties:
-        breakdown = score_property(prop, config=scoring_config)
+    for prop, breakdown in zip(all_properties, score_properties(all_properties, scoring_config)):
         if prop.status.lower() == "needs work":
             breakdown.penalty = NEEDS_WORK_PENALTY
             breakdown.final_score = max(0.0, round(breakdown.final_score + NEEDS_WORK_PENALTY, 1))
@@ -287,4 +427,14 @@ def _run_pipeline(config: dict, logger: logging.Logger, run_id: str) -> None:
 
 
 if __name__ == "__main__":
-    run()
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="keep running, reusing connections between runs (default: run once, for cron)",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=DEFAULT_INTERVAL_MINUTES, metavar="MINUTES",
+        help=f"minutes between runs in daemon mode (default: {DEFAULT_INTERVAL_MINUTES})",
+    )
+    args = parser.parse_args()
+    run(daemon=args.daemon, interval_minutes=args.interval)
@@ -2,13 +2,17 @@
 
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass, field
 from typing import Any
 
 SQFT_PER_ACRE = 43_560
 
+# Foundation types that rule out a basement
+_NON_BASEMENT = ("slab", "crawl space", "crawl", "pier", "pillar", "post")
 
-@dataclass
+
+@dataclass(slots=True)
 class Property:
     zpid: str = ""
     address: str = ""
@@ -101,7 +105,7 @@ def parse_from_rentcast(
         listing_price: Current asking price extracted from Zillow email.
     """
     # Lot size: RentCast reports in sqft — convert to acres
-    lot_sqft = _safe_float(_dig(data, "lotSize"))
+    lot_sqft = _safe_float(data.get("lotSize"))
     lot_acres = round(lot_sqft / SQFT_PER_ACRE, 2) if lot_sqft else 0.0
 
     # Features
@@ -118,10 +122,9 @@ def parse_from_rentcast(
         has_garage = None
 
     # Three-valued basement: foundation string > None
-    NON_BASEMENT = {"slab", "crawl space", "crawl", "pier", "pillar", "post"}
     if "basement" in foundation:
         has_basement = True
-    elif foundation and any(nb in foundation for nb in NON_BASEMENT):
+    elif foundation and any(nb in foundation for nb in _NON_BASEMENT):
         has_basement = False
     else:
         has_basement = None
@@ -135,35 +138,35 @@ def parse_from_rentcast(
 
     return Property(
         zpid=zpid,
-        address=str(_dig(data, "formattedAddress") or ""),
-        town=str(data.get("city", "") or ""),
+        address=str(data.get("formattedAddress") or ""),
+        town=sys.intern(str(data.get("city", "") or "")),
         price=listing_price,
-        bedrooms=_safe_int(_dig(data, "bedrooms")),
-        bathrooms=_safe_float(_dig(data, "bathrooms")),
-        sqft=_safe_int(_dig(data, "squareFootage")),
+        bedrooms=_safe_int(data.get("bedrooms")),
+        bathrooms=_safe_float(data.get("bathrooms")),
+        sqft=_safe_int(data.get("squareFootage")),
         lot_size_acres=lot_acres,
-        year_built=_safe_int(_dig(data, "yearBuilt")),
+        year_built=_safe_int(data.get("yearBuilt")),
         hoa_monthly=_safe_int(_dig(data, "hoa", "fee")),
         has_garage=has_garage,
         has_basement=has_basement,
         has_fireplace=has_fireplace,
-        property_type=str(_dig(data, "propertyType") or ""),
+        property_type=sys.intern(str(data.get("propertyType") or "")),
         listing_url=listing_url,
         # Additional API fields
-        last_sale_price=_safe_int(_dig(data, "lastSalePrice")),
-        last_sale_date=str(_dig(data, "lastSaleDate") or ""),
-        county=str(_dig(data, "county") or ""),
-        latitude=_safe_float(_dig(data, "latitude")),
-        longitude=_safe_float(_dig(data, "longitude")),
+        last_sale_price=_safe_int(data.get("lastSalePrice")),
+        last_sale_date=str(data.get("lastSaleDate") or ""),
+        county=sys.intern(str(data.get("county") or "")),
+        latitude=_safe_float(data.get("latitude")),
+        longitude=_safe_float(data.get("longitude")),
         has_pool=bool(features.get("pool")),
         has_cooling=bool(features.get("cooling")),
         has_heating=bool(features.get("heating")),
         garage_spaces=_safe_int(features.get("garageSpaces")),
         floor_count=_safe_int(features.get("floorCount")),
         room_count=_safe_int(features.get("roomCount")),
-        foundation_type=str(features.get("foundationType", "") or ""),
-        exterior_type=str(features.get("exteriorType", "") or ""),
-        roof_type=str(features.get("roofType", "") or ""),
-        property_tax=_most_recent_value(_dig(data, "propertyTaxes"), "total"),
-        tax_assessment=_most_recent_value(_dig(data, "taxAssessments"), "value"),
+        foundation_type=sys.intern(str(features.get("foundationType", "") or "")),
+        exterior_type=sys.intern(str(features.get("exteriorType", "") or "")),
+        roof_type=sys.intern(str(features.get("roofType", "") or "")),
+        property_tax=_most_recent_value(data.get("propertyTaxes"), "total"),
+        tax_assessment=_most_recent_value(data.get("taxAssessments"), "value"),
     )
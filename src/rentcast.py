@@ -5,31 +5,54 @@ from __future__ import annotations
 import logging
 
 import httpx
+import orjson
+
+from src.cache import DAY, ResponseCache
+from src.http_client import make_client
 
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.rentcast.io/v1"
 
+_CLIENT = make_client()
+
+# Property records rarely change day to day
+RENTCAST_CACHE_TTL = 30 * DAY
 
-def lookup_property(address: str, api_key: str) -> dict | None:
+
+def lookup_property(
+    address: str,
+    api_key: str,
+    client: httpx.Client | None = None,
+    cache: ResponseCache | None = None,
+) -> dict | None:
     """Look up a property by address via /v1/properties.
 
     Returns the full property record (beds, baths, sqft, lot, year,
-    features, HOA, etc.) or None on failure. One API call per property.
+    features, HOA, etc.) or None on failure. One API call per property,
+    unless `cache` already holds a fresh record for the address.
     """
+    cache_key = " ".join(address.lower().split())
+    if cache is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            logger.debug("RentCast cache hit for %s", address)
+            return cached
+
     try:
-        resp = httpx.get(
+        resp = (client or _CLIENT).get(
             f"{BASE_URL}/properties",
             params={"address": address},
             headers={"X-Api-Key": api_key, "Accept": "application/json"},
-            timeout=15.0,
         )
         if resp.status_code == 404:
             logger.warning("No property record for %s", address)
             return None
         resp.raise_for_status()
-        data = resp.json()
+        data = orjson.loads(resp.content)
         if isinstance(data, list) and data:
+            if cache is not None:
+                cache.set(cache_key, data[0])
             return data[0]
         return None
     except httpx.HTTPStatusError as e:
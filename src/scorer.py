@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import functools
+import os
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
@@ -10,6 +13,9 @@ import yaml
 
 from src.parser import Property
 
+# libyaml's C loader when PyYAML was built with it, else the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 
 @dataclass
 class ScoreBreakdown:
@@ -34,124 +40,194 @@ class ScoreBreakdown:
 
 
 def load_scoring_config(path: str | Path = "config/scoring.yaml") -> dict[str, Any]:
+    """Load the scoring matrix; the YAML is only re-parsed when the file changes.
+
+    The returned dict is shared between callers — treat it as read-only.
+    """
+    return _load_scoring_config(str(path), os.stat(path).st_mtime_ns)
+
+
+def load_yaml(path: str | Path) -> Any:
+    """Parse a YAML file with the fastest available safe loader."""
     with open(path) as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=_YAML_LOADER)
+
 
+@functools.lru_cache(maxsize=8)
+def _load_scoring_config(path: str, mtime_ns: int) -> dict[str, Any]:
+    return load_yaml(path)
 
-def _normalize(value: float, cfg: dict) -> float:
-    """Normalize a value to 0-100 based on min/max and direction."""
+
+def _clamp_score(score: float) -> float:
+    """Clamp to 0-100. Plain comparisons: cheaper in CPython than max(min())."""
+    if score >= 100.0:
+        return 100.0
+    if score > 0.0:
+        return score
+    return 0.0
+
+
+def _range_scorer(cfg: dict) -> Callable[[float], float]:
+    """Linear 0-100 between min and max, in the configured direction."""
     lo = float(cfg["min"])
     hi = float(cfg["max"])
-    direction = cfg.get("direction", "higher_is_better")
-
-    if hi == lo:
-        return 50.0
+    span = hi - lo
 
-    if direction == "lower_is_better":
-        score = (hi - value) / (hi - lo) * 100
-    else:
-        score = (value - lo) / (hi - lo) * 100
+    if span == 0:
+        return lambda value: 50.0
 
-    return max(0.0, min(100.0, score))
+    if cfg.get("direction", "higher_is_better") == "lower_is_better":
+        return lambda value: _clamp_score((hi - value) / span * 100)
+    return lambda value: _clamp_score((value - lo) / span * 100)
 
 
-def _normalize_threshold(value: float, cfg: dict) -> float:
-    """Normalize using threshold bands: full points under threshold, linear partial, zero above."""
+def _threshold_scorer(cfg: dict) -> Callable[[float], float]:
+    """Full points under a threshold, linear partial credit, zero above a cutoff."""
     full_under = float(cfg["full_points_under"])
     zero_over = float(cfg["zero_points_over"])
+    span = zero_over - full_under
 
-    if value <= full_under:
-        return 100.0
-    if value >= zero_over:
-        return 0.0
-    # Linear interpolation in the partial zone
-    return (zero_over - value) / (zero_over - full_under) * 100
+    def score(value: float) -> float:
+        if value <= full_under:
+            return 100.0
+        if value >= zero_over:
+            return 0.0
+        # Linear interpolation in the partial zone
+        return (zero_over - value) / span * 100
+
+    return score
 
 
-def _normalize_peak(value: float, cfg: dict) -> float:
-    """Normalize with a peak at the ideal value, dropping off linearly on both sides."""
+def _peak_scorer(cfg: dict) -> Callable[[float], float]:
+    """Peak at the ideal value, dropping off linearly on both sides."""
     ideal = float(cfg["ideal"])
     lo = float(cfg["min"])
     hi = float(cfg["max"])
+    rise = ideal - lo
+    fall = hi - ideal
 
-    if value <= lo or value >= hi:
-        return 0.0
-    if value <= ideal:
-        return (value - lo) / (ideal - lo) * 100
-    else:
-        return (hi - value) / (hi - ideal) * 100
+    def score(value: float) -> float:
+        if value <= lo or value >= hi:
+            return 0.0
+        if value <= ideal:
+            return (value - lo) / rise * 100
+        return (hi - value) / fall * 100
 
+    return score
 
-def _get_property_value(prop: Property, criterion: str) -> float | None:
-    """Get the numeric value for a criterion from a Property."""
-    if criterion == "commute":
-        if not prop.commute_minutes:
-            return None
-        return float(max(prop.commute_minutes.values()))
-
-    mapping = {
-        "lot_size_acres": prop.lot_size_acres,
-        "bedrooms": prop.bedrooms,
-        "bathrooms": prop.bathrooms,
-    }
-    val = mapping.get(criterion)
-    if val is None or val == 0:
+
+_SCORERS: dict[str | None, Callable[[dict], Callable[[float], float]]] = {
+    "threshold": _threshold_scorer,
+    "peak": _peak_scorer,
+}
+
+
+def _commute_value(prop: Property) -> float | None:
+    if not prop.commute_minutes:
         return None
-    return float(val)
+    return float(max(prop.commute_minutes.values()))
+
+
+def _attr_value(attr: str) -> Callable[[Property], float | None]:
+    """Getter for a numeric Property field; 0 counts as missing data."""
+    def value(prop: Property) -> float | None:
+        val = getattr(prop, attr)
+        if val is None or val == 0:
+            return None
+        return float(val)
+
+    return value
+
+
+_CRITERION_VALUES: dict[str, Callable[[Property], float | None]] = {
+    "commute": _commute_value,
+    "lot_size_acres": _attr_value("lot_size_acres"),
+    "bedrooms": _attr_value("bedrooms"),
+    "bathrooms": _attr_value("bathrooms"),
+}
+
+_BONUS_FIELDS = frozenset({"has_fireplace", "has_basement", "has_garage"})
+
+
+@dataclass(slots=True, frozen=True)
+class _Criterion:
+    name: str
+    weight: float
+    value: Callable[[Property], float | None]
+    score: Callable[[float], float]
+
+
+@dataclass(slots=True, frozen=True)
+class CompiledConfig:
+    """A scoring matrix with every per-criterion constant resolved up front."""
+
+    criteria: tuple[_Criterion, ...]
+    bonuses: tuple[tuple[str, float], ...]  # (Property bool field or unknown name, points)
+
+
+def compile_scoring_config(config: dict[str, Any]) -> CompiledConfig:
+    """Resolve weights, bounds and normalization functions once per config."""
+    criteria = tuple(
+        _Criterion(
+            name=name,
+            weight=float(cfg["weight"]),
+            value=_CRITERION_VALUES.get(name, lambda prop: None),
+            score=_SCORERS.get(cfg.get("scoring"), _range_scorer)(cfg),
+        )
+        for name, cfg in config.get("criteria", {}).items()
+    )
+    bonuses = tuple(
+        (name, float(cfg["points"])) for name, cfg in config.get("bonuses", {}).items()
+    )
+    return CompiledConfig(criteria=criteria, bonuses=bonuses)
+
+
+@functools.lru_cache(maxsize=8)
+def _compiled_from_file(path: str, mtime_ns: int) -> CompiledConfig:
+    return compile_scoring_config(_load_scoring_config(path, mtime_ns))
 
 
 def score_property(
     prop: Property,
-    config: dict[str, Any] | None = None,
+    config: dict[str, Any] | CompiledConfig | None = None,
     config_path: str | Path = "config/scoring.yaml",
 ) -> ScoreBreakdown:
     """Score a property against the scoring matrix.
 
+    `config` may be the raw YAML dict or, to skip per-call setup when scoring
+    many properties, the result of `compile_scoring_config`.
     Returns a ScoreBreakdown with per-criterion details, final score, and value ratio.
     """
     if config is None:
-        config = load_scoring_config(config_path)
-
-    criteria = config.get("criteria", {})
-    bonuses = config.get("bonuses", {})
+        compiled = _compiled_from_file(str(config_path), os.stat(config_path).st_mtime_ns)
+    elif isinstance(config, CompiledConfig):
+        compiled = config
+    else:
+        compiled = compile_scoring_config(config)
 
     criterion_scores: dict[str, float] = {}
     total_weighted = 0.0
     total_weight = 0.0
 
-    for name, cfg in criteria.items():
-        weight = float(cfg["weight"])
-        value = _get_property_value(prop, name)
+    for criterion in compiled.criteria:
+        value = criterion.value(prop)
 
         if value is None:
             # Missing data: skip this criterion (don't penalize)
             continue
 
-        scoring_type = cfg.get("scoring")
-        if scoring_type == "threshold":
-            normalized = _normalize_threshold(value, cfg)
-        elif scoring_type == "peak":
-            normalized = _normalize_peak(value, cfg)
-        else:
-            normalized = _normalize(value, cfg)
-
-        criterion_scores[name] = round(normalized, 1)
-        total_weighted += normalized * weight
-        total_weight += weight
+        normalized = criterion.score(value)
+        criterion_scores[criterion.name] = normalized
+        total_weighted += normalized * criterion.weight
+        total_weight += criterion.weight
 
     weighted_avg = total_weighted / total_weight if total_weight > 0 else 0.0
 
     bonus_scores: dict[str, float] = {}
     bonus_total = 0.0
-    bonus_mapping = {
-        "has_fireplace": prop.has_fireplace,
-        "has_basement": prop.has_basement,
-        "has_garage": prop.has_garage,
-    }
-
-    for name, cfg in bonuses.items():
-        points = float(cfg["points"])
-        if bonus_mapping.get(name) is True:
+
+    for name, points in compiled.bonuses:
+        if name in _BONUS_FIELDS and getattr(prop, name) is True:
             bonus_scores[name] = points
             bonus_total += points
         else:
@@ -173,3 +249,16 @@ def score_property(
         final_score=round(final, 1),
         value_ratio=value_ratio,
     )
+
+
+def score_properties(
+    props: Iterable[Property],
+    config: dict[str, Any] | CompiledConfig | None = None,
+    config_path: str | Path = "config/scoring.yaml",
+) -> list[ScoreBreakdown]:
+    """Score many properties against one matrix, resolving the config only once."""
+    if config is None:
+        config = _compiled_from_file(str(config_path), os.stat(config_path).st_mtime_ns)
+    elif not isinstance(config, CompiledConfig):
+        config = compile_scoring_config(config)
+    return [score_property(prop, config=config) for prop in props]
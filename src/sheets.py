@@ -1,18 +1,27 @@
 """Google Sheets integration — two-tab design.
 
-Listings tab: raw property data, append-only, never changes.
-Scores tab:   rebuilt from scratch every run using the current scoring matrix.
+Listings tab: raw property data, append-only (commute times may be backfilled).
+Scores tab:   recomputed every run using the current scoring matrix; only
+              rows whose contents changed are rewritten.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
+import random
+import sys
+import time
+from collections.abc import Callable, Collection
 from datetime import date
+from functools import cached_property
+from operator import itemgetter
 from pathlib import Path
-from typing import Any
+from typing import Any, TypeVar
 
 import gspread
+import orjson
 from google.oauth2.service_account import Credentials
 
 from src.parser import Property
@@ -62,6 +71,50 @@ LISTINGS_HEADERS = [
     "Foundation",
 ]
 
+# Fingerprint of the Listings layout. A marker file holding it records that
+# the tab's header row was already checked against exactly these headers.
+LISTINGS_HEADERS_VERSION = hashlib.md5(json.dumps(LISTINGS_HEADERS).encode()).hexdigest()
+
+
+T = TypeVar("T")
+
+# Sheets API statuses worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = frozenset({429, 500, 503})
+RETRY_ATTEMPTS = 6
+RETRY_BASE_SECONDS = 1.0
+RETRY_MAX_SECONDS = 64.0
+
+
+def _retry_delay(error: gspread.exceptions.APIError, attempt: int) -> float:
+    """Seconds to wait before retry `attempt` (0-based): Retry-After if sent, else jittered backoff."""
+    retry_after = error.response.headers.get("Retry-After") if error.response is not None else None
+    try:
+        if retry_after:
+            return min(float(retry_after), RETRY_MAX_SECONDS)
+    except ValueError:
+        pass  # HTTP-date form; fall back to backoff
+    delay = RETRY_BASE_SECONDS * 2 ** attempt + random.random() * RETRY_BASE_SECONDS
+    return min(delay, RETRY_MAX_SECONDS)
+
+
+def _with_retry(
+    fn: Callable[..., T], *args: Any, retry_statuses: Collection[int] = RETRY_STATUSES, **kwargs: Any,
+) -> T:
+    """Call a gspread method, retrying APIErrors whose status is in `retry_statuses`.
+
+    Other errors, and the last failed attempt, are re-raised unchanged.
+    """
+    for attempt in range(RETRY_ATTEMPTS - 1):
+        try:
+            return fn(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            if e.code not in retry_statuses:
+                raise
+            delay = _retry_delay(e, attempt)
+            logger.warning("Sheets API error %s, retrying in %.1fs", e.code, delay)
+            time.sleep(delay)
+    return fn(*args, **kwargs)
+
 
 def _build_scores_headers(commute_labels: list[str]) -> list[str]:
     """Build Scores tab headers dynamically based on configured commute destinations."""
@@ -88,27 +141,117 @@ def _build_scores_headers(commute_labels: list[str]) -> list[str]:
     return headers
 
 
+_BOOL_TO_CELL: dict[bool | None, str] = {True: "Yes", False: "No", None: ""}
+_CELL_TO_BOOL: dict[str, bool] = {"yes": True, "no": False}
+# The cells _bool_to_cell writes, matched before any normalizing
+_CELL_TO_BOOL_EXACT: dict[str, bool | None] = {"Yes": True, "No": False, "": None}
+
+
 def _bool_to_cell(val: bool | None) -> str:
     """Convert three-valued bool to sheet cell: True→'Yes', False→'No', None→''."""
-    if val is True:
-        return "Yes"
-    if val is False:
-        return "No"
-    return ""
+    return _BOOL_TO_CELL.get(val, "")
 
 
 def _cell_to_bool(val: str) -> bool | None:
     """Convert sheet cell to three-valued bool: 'yes'→True, 'no'→False, ''→None."""
-    s = str(val).strip().lower()
-    if s == "yes":
-        return True
-    if s == "no":
-        return False
-    return None
+    if val in _CELL_TO_BOOL_EXACT:
+        return _CELL_TO_BOOL_EXACT[val]
+    return _CELL_TO_BOOL.get(str(val).strip().lower())
+
+
+def build_listing_row(prop: Property, date_added: str | None = None) -> list[Any]:
+    """Build a Listings tab row (in LISTINGS_HEADERS order) for a property.
+
+    `date_added` defaults to today; pass it in when building a batch of rows.
+    """
+    return [
+        prop.listing_url,
+        date_added or date.today().isoformat(),
+        "",  # Status — user-editable
+        prop.zpid,
+        prop.town,
+        prop.address,
+        prop.price,
+        prop.property_tax,
+        prop.bedrooms,
+        prop.bathrooms,
+        prop.sqft,
+        prop.lot_size_acres,
+        orjson.dumps(prop.commute_minutes).decode() if prop.commute_minutes else "",
+        _bool_to_cell(prop.has_garage),
+        _bool_to_cell(prop.has_basement),
+        _bool_to_cell(prop.has_fireplace),
+        prop.year_built,
+        prop.hoa_monthly,
+        prop.last_sale_price,
+        prop.last_sale_date,
+        prop.property_type,
+        prop.county,
+        prop.tax_assessment,
+        "Yes" if prop.has_pool else "No",
+        "Yes" if prop.has_heating else "No",
+        "Yes" if prop.has_cooling else "No",
+        prop.floor_count,
+        prop.room_count,
+        prop.exterior_type,
+        prop.roof_type,
+        prop.latitude,
+        prop.longitude,
+        prop.garage_spaces,
+        prop.foundation_type,
+    ]
 
 
-def _col_letter(n: int) -> str:
-    """Convert 1-based column number to letter(s): 1→A, 26→Z, 27→AA."""
+def build_score_row(
+    prop: Property, breakdown: ScoreBreakdown, commute_labels: list[str],
+) -> list[Any]:
+    """Build a Scores tab row (in _build_scores_headers order) for a scored property."""
+    commutes = prop.commute_minutes
+    return [
+        breakdown.value_ratio,
+        breakdown.final_score,
+        prop.address,
+        prop.price,
+        *[commutes.get(label, "") for label in commute_labels],
+        prop.bedrooms,
+        prop.bathrooms,
+        prop.sqft,
+        prop.lot_size_acres,
+        _bool_to_cell(prop.has_garage),
+        _bool_to_cell(prop.has_basement),
+        _bool_to_cell(prop.has_fireplace),
+        breakdown.summary(),
+        prop.zpid,
+        prop.listing_url,
+    ]
+
+
+def _row_key(row: list[Any]) -> tuple[str, ...]:
+    """Normalize a row for comparison with values read back from Sheets.
+
+    Sheets returns 2.0 as 2 and drops trailing empty cells, so compare
+    integral floats as ints, everything as text, and ignore trailing blanks.
+    """
+    cells = [str(int(v)) if isinstance(v, float) and v.is_integer() else str(v) for v in row]
+    while cells and cells[-1] == "":
+        cells.pop()
+    return tuple(cells)
+
+
+def _changed_row_runs(existing: list[list[Any]], rows: list[list[Any]]) -> list[tuple[int, int]]:
+    """Return [start, end) index runs of `rows` that differ from `existing`."""
+    runs: list[tuple[int, int]] = []
+    for i, row in enumerate(rows):
+        if i < len(existing) and _row_key(existing[i]) == _row_key(row):
+            continue
+        if runs and runs[-1][1] == i:
+            runs[-1] = (runs[-1][0], i + 1)
+        else:
+            runs.append((i, i + 1))
+    return runs
+
+
+def _compute_col_letter(n: int) -> str:
     result = ""
     while n > 0:
         n, rem = divmod(n - 1, 26)
@@ -116,6 +259,100 @@ def _col_letter(n: int) -> str:
     return result
 
 
+# Column letters A..ZZ, precomputed once
+_COL_LETTERS = tuple(_compute_col_letter(n) for n in range(1, 27 * 26 + 1))
+
+
+def _col_letter(n: int) -> str:
+    """Convert 1-based column number to letter(s): 1→A, 26→Z, 27→AA."""
+    if 0 < n <= len(_COL_LETTERS):
+        return _COL_LETTERS[n - 1]
+    return _compute_col_letter(n)
+
+
+# Listings column positions (0-based) and the A1 letters of the columns
+# addressed by range, resolved once instead of LISTINGS_HEADERS.index scans
+_LISTINGS_IDX = {name: i for i, name in enumerate(LISTINGS_HEADERS)}
+_ZPID_IDX = _LISTINGS_IDX["ZPID"]
+_COMMUTES_COL_LETTER = _col_letter(_LISTINGS_IDX["Commutes"] + 1)
+_PRICE_COL_LETTER = _col_letter(_LISTINGS_IDX["Listing Price"] + 1)
+_TAX_COL_LETTER = _col_letter(_LISTINGS_IDX["Property Tax"] + 1)
+
+
+def _grid_range(sheet_id: int, start_row: int, end_row: int | None, num_cols: int | None = None) -> dict[str, Any]:
+    """0-based, end-exclusive GridRange; None bounds extend to the edge of the sheet."""
+    grid: dict[str, Any] = {"sheetId": sheet_id, "startRowIndex": start_row}
+    if end_row is not None:
+        grid["endRowIndex"] = end_row
+    if num_cols is not None:
+        grid.update(startColumnIndex=0, endColumnIndex=num_cols)
+    return grid
+
+
+def _cell_data(value: Any) -> dict[str, Any]:
+    """CellData for a plain Python value; blanks produce an empty (cleared) cell."""
+    if value is None or value == "":
+        return {}
+    if isinstance(value, bool):
+        return {"userEnteredValue": {"boolValue": value}}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
+
+
+def _write_rows(sheet_id: int, start_row: int, rows: list[list[Any]]) -> dict[str, Any]:
+    """updateCells request writing `rows` from column A of `start_row` (0-based)."""
+    return {
+        "updateCells": {
+            "start": {"sheetId": sheet_id, "rowIndex": start_row, "columnIndex": 0},
+            "rows": [{"values": [_cell_data(v) for v in row]} for row in rows],
+            "fields": "userEnteredValue",
+        }
+    }
+
+
+def _clear_rows(sheet_id: int, start_row: int, end_row: int | None = None) -> dict[str, Any]:
+    """updateCells request clearing values and background colors of whole rows."""
+    return {
+        "updateCells": {
+            "range": _grid_range(sheet_id, start_row, end_row),
+            "fields": "userEnteredValue,userEnteredFormat.backgroundColor",
+        }
+    }
+
+
+def _append_dimension(sheet_id: int, dimension: str, length: int) -> dict[str, Any]:
+    return {"appendDimension": {"sheetId": sheet_id, "dimension": dimension, "length": length}}
+
+
+def _tier_color_requests(sheet_id: int, n: int, num_cols: int) -> list[dict[str, Any]]:
+    """repeatCell requests color-coding `n` sorted Scores rows by relative ranking (thirds)."""
+    if n == 0:
+        return []
+    top_cutoff = n // 3 or 1  # at least 1 row in top tier
+    mid_cutoff = min(2 * n // 3 or top_cutoff + 1, n)
+    # Tiers are contiguous because rows are sorted, so one range per tier.
+    # Rows persist between runs, so the bottom tier is reset to white
+    # for rows that dropped out of the top tiers.
+    tiers = [
+        (0, top_cutoff, {"red": 0.85, "green": 0.95, "blue": 0.85}),
+        (top_cutoff, mid_cutoff, {"red": 1.0, "green": 0.97, "blue": 0.8}),
+        (mid_cutoff, n, {"red": 1.0, "green": 1.0, "blue": 1.0}),
+    ]
+    return [
+        {
+            "repeatCell": {
+                # Data rows start below the header
+                "range": _grid_range(sheet_id, start + 1, end + 1, num_cols),
+                "cell": {"userEnteredFormat": {"backgroundColor": bg}},
+                "fields": "userEnteredFormat.backgroundColor",
+            }
+        }
+        for start, end, bg in tiers
+        if start < end
+    ]
+
+
 class SheetsClient:
     def __init__(
         self,
@@ -123,155 +360,268 @@ class SheetsClient:
         spreadsheet_id: str,
         listings_tab: str = "Listings",
         scores_tab: str = "Scores",
+        marker_dir: str | Path | None = None,
     ):
         creds = Credentials.from_service_account_file(
             str(credentials_file), scopes=SCOPES
         )
         self.gc = gspread.authorize(creds)
-        self.spreadsheet = self.gc.open_by_key(spreadsheet_id)
+        self.spreadsheet = _with_retry(self.gc.open_by_key, spreadsheet_id)
         self.listings_tab_name = listings_tab
         self.scores_tab_name = scores_tab
-        self._ensure_listings_tab()
+        self._zpids: set[str] | None = None  # Listings ZPIDs as of the last read/append
+        # Lets later runs skip the header check; None always checks
+        self._header_marker = (
+            Path(marker_dir) / f"{spreadsheet_id}.headers" if marker_dir else None
+        )
 
-    # ------------------------------------------------------------------ #
-    #  Listings tab — raw data, append-only
-    # ------------------------------------------------------------------ #
+    @cached_property
+    def _tabs(self) -> dict[str, gspread.Worksheet]:
+        """Every tab from one metadata read.
+
+        Each entry serves only the first lookup of its tab, so later runs
+        see current grid sizes.
+        """
+        return {ws.title: ws for ws in _with_retry(self.spreadsheet.worksheets)}
 
-    def _ensure_listings_tab(self) -> None:
-        """Create the Listings tab with headers if it doesn't exist."""
+    def _get_or_add_worksheet(self, title: str, cols: int) -> tuple[gspread.Worksheet, bool]:
+        """Return the tab named `title`, creating it if needed, and whether it was created."""
+        ws = self._tabs.pop(title, None)
+        if ws is not None:
+            return ws, False
         try:
-            self.listings_ws = self.spreadsheet.worksheet(self.listings_tab_name)
+            return _with_retry(self.spreadsheet.worksheet, title), False
         except gspread.exceptions.WorksheetNotFound:
-            self.listings_ws = self.spreadsheet.add_worksheet(
-                title=self.listings_tab_name,
-                rows=1000,
-                cols=len(LISTINGS_HEADERS),
+            # A 5xx may have created the tab anyway, so only a rate-limited
+            # (rejected) add is safe to resend
+            ws = _with_retry(
+                self.spreadsheet.add_worksheet, title=title, rows=1000, cols=cols, retry_statuses=(429,),
             )
+            return ws, True
+
+    # ------------------------------------------------------------------ #
+    #  Listings tab — raw data, append-only
+    # ------------------------------------------------------------------ #
+
+    @cached_property
+    def listings_ws(self) -> gspread.Worksheet:
+        """The Listings tab, looked up and set up on first use rather than at construction."""
+        return self._ensure_listings_tab()
 
-        existing = self.listings_ws.row_values(1)
+    def _ensure_listings_tab(self) -> gspread.Worksheet:
+        """Return the Listings tab, creating it with headers if it doesn't exist.
+
+        The header row and formats are only checked when the marker file
+        doesn't already record a check against the current LISTINGS_HEADERS.
+        """
+        ws, created = self._get_or_add_worksheet(self.listings_tab_name, len(LISTINGS_HEADERS))
+        if not created and self._headers_marked():
+            return ws
+
+        existing = _with_retry(ws.row_values, 1)
         if not existing or existing != LISTINGS_HEADERS:
-            self.listings_ws.update("A1", [LISTINGS_HEADERS])
-            self._bold_row(self.listings_ws, len(LISTINGS_HEADERS))
+            _with_retry(ws.update, "A1", [LISTINGS_HEADERS])
+            self._bold_row(ws, len(LISTINGS_HEADERS))
 
-        self._apply_currency_format(self.listings_ws)
+        self._apply_currency_format(ws)
+        self._mark_headers()
+        return ws
+
+    def _headers_marked(self) -> bool:
+        if self._header_marker is None:
+            return False
+        try:
+            return self._header_marker.read_text().strip() == LISTINGS_HEADERS_VERSION
+        except OSError:
+            return False
+
+    def _mark_headers(self) -> None:
+        if self._header_marker is None:
+            return
+        try:
+            self._header_marker.parent.mkdir(parents=True, exist_ok=True)
+            self._header_marker.write_text(LISTINGS_HEADERS_VERSION + "\n")
+        except OSError as e:
+            logger.debug("Could not write header marker: %s", e)
 
     def get_existing_zpids(self) -> set[str]:
-        """Return the set of ZPIDs already in the Listings tab."""
+        """Return the set of ZPIDs already in the Listings tab.
+
+        Read from the sheet once, then kept current by this client's own
+        appends; see refresh_zpid_cache for picking up edits made elsewhere.
+        """
+        if self._zpids is None:
+            return self.refresh_zpid_cache()
+        return set(self._zpids)
+
+    def refresh_zpid_cache(self) -> set[str]:
+        """Re-read the ZPID column, e.g. at the start of each daemon run.
+
+        A failed read returns an empty set; failing to set up the Listings
+        tab itself raises.
+        """
+        ws = self.listings_ws
         try:
-            col = LISTINGS_HEADERS.index("ZPID") + 1
-            zpids = self.listings_ws.col_values(col)
-            return set(zpids[1:])  # skip header
+            zpids = _with_retry(ws.col_values, _ZPID_IDX + 1)
         except Exception as e:
             logger.warning("Could not read ZPIDs: %s", e)
             return set()
+        self._zpids = set(zpids[1:])  # skip header
+        return set(self._zpids)
 
     def add_listing(self, prop: Property) -> bool:
         """Append raw property data to Listings. Returns False if duplicate."""
-        existing = self.get_existing_zpids()
-        if prop.zpid in existing:
-            logger.info("ZPID %s already in Listings, skipping", prop.zpid)
-            return False
+        return self.add_listings([prop])[0]
+
+    def add_listings(self, props: list[Property]) -> list[bool]:
+        """Append the properties not yet in Listings in one API call.
+
+        Returns one flag per property: False if it was a duplicate.
+        The ZPID column is read at most once per client, not once per listing.
+        """
+        seen = self.get_existing_zpids()
+
+        added: list[bool] = []
+        rows: list[list[Any]] = []
+        today = date.today().isoformat()
+        for prop in props:
+            if prop.zpid in seen:
+                logger.info("ZPID %s already in Listings, skipping", prop.zpid)
+                added.append(False)
+                continue
+            seen.add(prop.zpid)
+            rows.append(build_listing_row(prop, today))
+            added.append(True)
+
+        self.append_listings(rows)
+        return added
+
+    def append_listings(self, rows: list[list[Any]]) -> None:
+        """Append pre-built Listings rows (see build_listing_row) in one API call."""
+        if rows:
+            # A 5xx may have landed the rows anyway, so only a rate-limited
+            # (rejected) append is safe to resend
+            _with_retry(
+                self.listings_ws.append_rows, rows,
+                value_input_option="USER_ENTERED", retry_statuses=(429,),
+            )
+            if self._zpids is not None:
+                self._zpids.update(str(row[_ZPID_IDX]) for row in rows)
+            logger.info("Added %d listing(s) to Listings tab", len(rows))
 
-        row = [
-            prop.listing_url,
-            date.today().isoformat(),
-            "",  # Status — user-editable
-            prop.zpid,
-            prop.town,
-            prop.address,
-            prop.price,
-            prop.property_tax,
-            prop.bedrooms,
-            prop.bathrooms,
-            prop.sqft,
-            prop.lot_size_acres,
-            json.dumps(prop.commute_minutes) if prop.commute_minutes else "",
-            _bool_to_cell(prop.has_garage),
-            _bool_to_cell(prop.has_basement),
-            _bool_to_cell(prop.has_fireplace),
-            prop.year_built,
-            prop.hoa_monthly,
-            prop.last_sale_price,
-            prop.last_sale_date,
-            prop.property_type,
-            prop.county,
-            prop.tax_assessment,
-            "Yes" if prop.has_pool else "No",
-            "Yes" if prop.has_heating else "No",
-            "Yes" if prop.has_cooling else "No",
-            prop.floor_count,
-            prop.room_count,
-            prop.exterior_type,
-            prop.roof_type,
-            prop.latitude,
-            prop.longitude,
-            prop.garage_spaces,
-            prop.foundation_type,
+    def update_commutes(self, commutes_by_zpid: dict[str, dict[str, int]]) -> int:
+        """Fill in the Commutes cell of existing listings in one batch write.
+
+        Only the Commutes column is touched. Returns the number of rows updated.
+        """
+        zpids = _with_retry(self.listings_ws.col_values, _ZPID_IDX + 1)
+        updates = [
+            {"range": f"{_COMMUTES_COL_LETTER}{row_num}", "values": [[orjson.dumps(commutes_by_zpid[zpid]).decode()]]}
+            for row_num, zpid in enumerate(zpids, start=1)
+            if row_num > 1 and zpid in commutes_by_zpid
         ]
+        if updates:
+            _with_retry(self.listings_ws.batch_update, updates, value_input_option="RAW")
+        return len(updates)
 
-        self.listings_ws.append_row(row, value_input_option="USER_ENTERED")
-        logger.info("Added %s to Listings tab", prop.address)
-        return True
+    def read_all_listings(self, skip_statuses: Collection[str] = ()) -> list[Property]:
+        """Read all properties back from the Listings tab.
 
-    def read_all_listings(self) -> list[Property]:
-        """Read all properties back from the Listings tab."""
-        rows = self.listings_ws.get_all_records(value_render_option="UNFORMATTED_VALUE")
+        Rows whose Status is in `skip_statuses` (case-insensitive) are left
+        out before any Property is built for them.
+        """
+        values = _with_retry(
+            self.listings_ws.get_all_values, value_render_option="UNFORMATTED_VALUE",
+        )
+        if not values:
+            return []
+        header, *data = values
         properties: list[Property] = []
 
-        for row in rows:
+        # One itemgetter puts each row's cells in LISTINGS_HEADERS order. Every
+        # row is cut or padded to exactly width + 1 cells, so a column missing
+        # from the sheet always reads the trailing blank, never a stray cell
+        width = len(header)
+        col = {name: i for i, name in enumerate(header)}
+        pick = itemgetter(*(col.get(name, width) for name in LISTINGS_HEADERS))
+        blank = [""] * (width + 1)
+
+        skip = {status.lower() for status in skip_statuses}
+        skipped = 0
+        loads = orjson.loads
+        intern = sys.intern
+        cell_to_bool = _cell_to_bool
+        new_property = Property
+
+        for cells in data:
+            cells = cells[:width] + blank[min(len(cells), width):]
+            (
+                link, _date_added, status, zpid, town, address, price, tax,
+                beds, baths, sqft, lot, commute_raw, garage, basement, fireplace,
+                year_built, hoa, sale_price, sale_date, property_type, county,
+                assessment, pool, heating, cooling, floors, rooms, exterior,
+                roof, latitude, longitude, garage_spaces, foundation,
+            ) = pick(cells)
+            if skip and str(status).lower() in skip:
+                skipped += 1
+                continue
             try:
                 # Parse commute data from JSON string
-                commute_raw = row.get("Commutes", "")
                 if commute_raw and isinstance(commute_raw, str):
                     try:
-                        commute_minutes = json.loads(commute_raw)
-                    except (json.JSONDecodeError, TypeError):
+                        commute_minutes = loads(commute_raw)
+                    except orjson.JSONDecodeError:
                         commute_minutes = {}
                 else:
                     commute_minutes = {}
 
-                properties.append(Property(
-                    zpid=str(row.get("ZPID", "")),
-                    address=str(row.get("Address", "")),
-                    town=str(row.get("Town", "")),
-                    price=int(row.get("Listing Price", 0) or 0),
-                    bedrooms=int(row.get("Beds", 0) or 0),
-                    bathrooms=float(row.get("Baths", 0) or 0),
-                    sqft=int(row.get("SqFt", 0) or 0),
-                    lot_size_acres=float(row.get("Lot (acres)", 0) or 0),
-                    year_built=int(row.get("Year Built", 0) or 0),
-                    hoa_monthly=int(row.get("HOA", 0) or 0),
-                    has_garage=_cell_to_bool(row.get("Garage", "")),
-                    has_basement=_cell_to_bool(row.get("Basement", "")),
-                    has_fireplace=_cell_to_bool(row.get("Fireplace", "")),
-                    property_type=str(row.get("Property Type", "")),
-                    listing_url=str(row.get("Link", "")),
-                    last_sale_price=int(row.get("Last Sale Price", 0) or 0),
-                    last_sale_date=str(row.get("Last Sale Date", "")),
-                    county=str(row.get("County", "")),
-                    latitude=float(row.get("Latitude", 0) or 0),
-                    longitude=float(row.get("Longitude", 0) or 0),
-                    has_pool=str(row.get("Pool", "")).lower() == "yes",
-                    has_cooling=str(row.get("Cooling", "")).lower() == "yes",
-                    has_heating=str(row.get("Heating", "")).lower() == "yes",
-                    garage_spaces=int(row.get("Garage Spaces", 0) or 0),
-                    floor_count=int(row.get("Floors", 0) or 0),
-                    room_count=int(row.get("Rooms", 0) or 0),
-                    foundation_type=str(row.get("Foundation", "")),
-                    exterior_type=str(row.get("Exterior", "")),
-                    roof_type=str(row.get("Roof", "")),
-                    property_tax=int(row.get("Property Tax", 0) or 0),
-                    tax_assessment=int(row.get("Tax Assessment", 0) or 0),
-                    commute_minutes=commute_minutes,
-                    status=str(row.get("Status", "")),
+                # Positional, in Property field order: ~30 keyword arguments
+                # cost several times more to bind than the same positionals
+                properties.append(new_property(
+                    str(zpid),                      # zpid
+                    str(address),                   # address
+                    intern(str(town)),              # town
+                    int(price or 0),                # price
+                    int(beds or 0),                 # bedrooms
+                    float(baths or 0),              # bathrooms
+                    int(sqft or 0),                 # sqft
+                    float(lot or 0),                # lot_size_acres
+                    int(year_built or 0),           # year_built
+                    int(hoa or 0),                  # hoa_monthly
+                    cell_to_bool(garage),           # has_garage
+                    cell_to_bool(basement),         # has_basement
+                    cell_to_bool(fireplace),        # has_fireplace
+                    0,                              # days_on_zillow (not stored)
+                    intern(str(property_type)),     # property_type
+                    str(link),                      # listing_url
+                    int(sale_price or 0),           # last_sale_price
+                    str(sale_date),                 # last_sale_date
+                    intern(str(county)),            # county
+                    float(latitude or 0),           # latitude
+                    float(longitude or 0),          # longitude
+                    str(pool).lower() == "yes",     # has_pool
+                    str(cooling).lower() == "yes",  # has_cooling
+                    str(heating).lower() == "yes",  # has_heating
+                    int(garage_spaces or 0),        # garage_spaces
+                    int(floors or 0),               # floor_count
+                    int(rooms or 0),                # room_count
+                    intern(str(foundation)),        # foundation_type
+                    intern(str(exterior)),          # exterior_type
+                    intern(str(roof)),              # roof_type
+                    int(tax or 0),                  # property_tax
+                    int(assessment or 0),           # tax_assessment
+                    commute_minutes,                # commute_minutes
+                    intern(str(status)),            # status
                 ))
             except (ValueError, TypeError) as e:
-                logger.warning("Skipping malformed Listings row (ZPID %s): %s", row.get("ZPID"), e)
+                logger.warning("Skipping malformed Listings row (ZPID %s): %s", zpid, e)
 
+        if skipped:
+            logger.info("Skipped %d listing(s) with status %s", skipped, "/".join(sorted(skip)))
         return properties
 
     # ------------------------------------------------------------------ #
-    #  Scores tab — rebuilt from scratch every run
+    #  Scores tab — recomputed every run, changed rows rewritten
     # ------------------------------------------------------------------ #
 
     def rebuild_scores(
@@ -279,8 +629,11 @@ class SheetsClient:
         scored: list[tuple[Property, ScoreBreakdown]],
         commute_labels: list[str] | None = None,
     ) -> None:
-        """Clear and rewrite the Scores tab with current rankings.
+        """Bring the Scores tab up to date with current rankings.
 
+        Only rows whose contents changed are rewritten; the whole tab is
+        rebuilt when the columns change. Writes, clears, header bold and tier
+        colors all go out in a single batchUpdate.
         `scored` should already be sorted by value_ratio descending.
         `commute_labels` is the list of destination labels for commute columns.
         """
@@ -290,81 +643,58 @@ class SheetsClient:
         headers = _build_scores_headers(commute_labels)
 
         # Get or create the Scores tab
-        try:
-            scores_ws = self.spreadsheet.worksheet(self.scores_tab_name)
-        except gspread.exceptions.WorksheetNotFound:
-            scores_ws = self.spreadsheet.add_worksheet(
-                title=self.scores_tab_name,
-                rows=1000,
-                cols=len(headers),
-            )
-
-        last_col = _col_letter(len(headers))
+        scores_ws, _ = self._get_or_add_worksheet(self.scores_tab_name, len(headers))
 
         # Build all rows (header + data) in one batch
         rows: list[list[Any]] = [headers]
-        for prop, breakdown in scored:
-            row: list[Any] = [
-                breakdown.value_ratio,
-                breakdown.final_score,
-                prop.address,
-                prop.price,
-            ]
-            for label in commute_labels:
-                row.append(prop.commute_minutes.get(label, ""))
-            row += [
-                prop.bedrooms,
-                prop.bathrooms,
-                prop.sqft,
-                prop.lot_size_acres,
-                _bool_to_cell(prop.has_garage),
-                _bool_to_cell(prop.has_basement),
-                _bool_to_cell(prop.has_fireplace),
-                breakdown.summary(),
-                prop.zpid,
-                prop.listing_url,
-            ]
-            rows.append(row)
-
-        # Clear the entire sheet and write in one call
-        scores_ws.clear()
-        if rows:
-            scores_ws.update(f"A1:{last_col}{len(rows)}", rows, value_input_option="USER_ENTERED")
-
-        self._bold_row(scores_ws, len(headers))
-        self._color_score_rows(scores_ws, scored, len(headers))
+        rows += [build_score_row(prop, breakdown, commute_labels) for prop, breakdown in scored]
 
-        logger.info("Scores tab rebuilt with %d listings", len(scored))
-
-    def _color_score_rows(
-        self,
-        ws: gspread.Worksheet,
-        scored: list[tuple[Property, ScoreBreakdown]],
-        num_cols: int,
-    ) -> None:
-        """Batch color-code rows on the Scores tab by relative ranking (thirds)."""
-        last_col = _col_letter(num_cols)
-        n = len(scored)
-        if n == 0:
-            return
-        top_cutoff = n // 3 or 1  # at least 1 row in top tier
-        mid_cutoff = 2 * n // 3 or top_cutoff + 1
-        try:
-            formats = []
-            for i in range(n):
-                row_num = i + 2  # 1-indexed, skip header
-                if i < top_cutoff:
-                    bg = {"red": 0.85, "green": 0.95, "blue": 0.85}
-                elif i < mid_cutoff:
-                    bg = {"red": 1.0, "green": 0.97, "blue": 0.8}
-                else:
-                    continue
-                formats.append({"range": f"A{row_num}:{last_col}{row_num}", "format": {"backgroundColor": bg}})
+        existing = _with_retry(
+            scores_ws.get_all_values, value_render_option="UNFORMATTED_VALUE",
+        )
+        sheet_id = scores_ws.id
+
+        # Everything below goes out as one spreadsheets.batchUpdate
+        requests: list[dict[str, Any]] = []
+
+        # Cell writes can't extend past the grid, so grow it first
+        if len(rows) > scores_ws.row_count:
+            requests.append(_append_dimension(sheet_id, "ROWS", len(rows) - scores_ws.row_count))
+        if len(headers) > scores_ws.col_count:
+            requests.append(_append_dimension(sheet_id, "COLUMNS", len(headers) - scores_ws.col_count))
+
+        if not existing or _row_key(existing[0]) != _row_key(headers):
+            # New tab or different columns (e.g. commute destinations changed):
+            # wipe the whole tab and write every row
+            requests.append(_clear_rows(sheet_id, 0))
+            requests.append(_write_rows(sheet_id, 0, rows))
+            requests.append({
+                "repeatCell": {
+                    "range": _grid_range(sheet_id, 0, 1, len(headers)),
+                    "cell": {"userEnteredFormat": {"textFormat": {"bold": True}}},
+                    "fields": "userEnteredFormat.textFormat.bold",
+                }
+            })
+            message = f"Scores tab rebuilt with {len(scored)} listings"
+        else:
+            # Same columns: only rewrite the rows whose contents changed
+            runs = _changed_row_runs(existing, rows)
+            stale = len(existing) > len(rows)
+            if not runs and not stale:
+                logger.info("Scores tab unchanged (%d listings)", len(scored))
+                return
+
+            requests += [_write_rows(sheet_id, start, rows[start:end]) for start, end in runs]
+            if stale:
+                requests.append(_clear_rows(sheet_id, len(rows), len(existing)))
+            message = (
+                f"Scores tab updated: {sum(end - start for start, end in runs)} "
+                f"of {len(scored)} listings changed"
+            )
 
-            if formats:
-                ws.batch_format(formats)
-        except Exception as e:
-            logger.debug("Could not color-code Scores tab: %s", e)
+        requests += _tier_color_requests(sheet_id, len(scored), len(headers))
+        _with_retry(self.spreadsheet.batch_update, {"requests": requests})
+        logger.info(message)
 
     # ------------------------------------------------------------------ #
     #  Shared helpers
@@ -374,7 +704,7 @@ class SheetsClient:
     def _bold_row(ws: gspread.Worksheet, num_cols: int) -> None:
         col_letter = _col_letter(num_cols)
         try:
-            ws.format(f"A1:{col_letter}1", {"textFormat": {"bold": True}})
+            _with_retry(ws.format, f"A1:{col_letter}1", {"textFormat": {"bold": True}})
         except Exception as e:
             logger.debug("Could not bold header: %s", e)
 
@@ -382,10 +712,9 @@ class SheetsClient:
     def _apply_currency_format(ws: gspread.Worksheet) -> None:
         """Apply currency format ($#,##0) to Listing Price and Property Tax columns."""
         currency_fmt = {"numberFormat": {"type": "CURRENCY", "pattern": "$#,##0"}}
-        price_col = _col_letter(LISTINGS_HEADERS.index("Listing Price") + 1)
-        tax_col = _col_letter(LISTINGS_HEADERS.index("Property Tax") + 1)
+        price_col, tax_col = _PRICE_COL_LETTER, _TAX_COL_LETTER
         try:
-            ws.batch_format([
+            _with_retry(ws.batch_format, [
                 {"range": f"{price_col}2:{price_col}1000", "format": currency_fmt},
                 {"range": f"{tax_col}2:{tax_col}1000", "format": currency_fmt},
             ])
@@ -0,0 +1,18 @@
+"""Shared pytest fixtures."""
+
+import httpx
+import pytest
+
+_REQUEST = httpx.Request("GET", "https://api.example.test/")
+
+
+@pytest.fixture
+def make_response():
+    """Factory for real httpx.Responses carrying a JSON body.
+
+    A real Response keeps raise_for_status behaving as it does in production.
+    """
+    def make(json_data, status_code: int = 200) -> httpx.Response:
+        return httpx.Response(status_code, json=json_data, request=_REQUEST)
+
+    return make
@@ -0,0 +1,34 @@
+"""Tests for the SQLite-backed API response cache."""
+
+from unittest.mock import patch
+
+from src.cache import ResponseCache
+
+
+class TestResponseCache:
+    def test_round_trip(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", "rentcast", ttl=60)
+        cache.set("408 manchester rd", {"bedrooms": 3, "features": {"garage": True}})
+        assert cache.get("408 manchester rd") == {"bedrooms": 3, "features": {"garage": True}}
+
+    def test_miss_returns_none(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", "rentcast", ttl=60)
+        assert cache.get("nowhere") is None
+
+    def test_expired_entry_is_a_miss(self, tmp_path):
+        cache = ResponseCache(tmp_path / "cache.sqlite", "rentcast", ttl=60)
+        with patch("src.cache.time.time", return_value=1_000.0):
+            cache.set("key", {"a": 1})
+        with patch("src.cache.time.time", return_value=1_061.0):
+            assert cache.get("key") is None
+
+    def test_tables_are_independent(self, tmp_path):
+        path = tmp_path / "cache.sqlite"
+        rentcast = ResponseCache(path, "rentcast", ttl=60)
+        commute = ResponseCache(path, "commute", ttl=60)
+        rentcast.set("key", {"a": 1})
+        assert commute.get("key") is None
+
+    def test_persists_across_instances(self, tmp_path):
+        ResponseCache(tmp_path / "cache.sqlite", "commute", ttl=60).set("key", {"Work": 32})
+        assert ResponseCache(tmp_path / "cache.sqlite", "commute", ttl=60).get("key") == {"Work": 32}
@@ -1,27 +1,20 @@
 """Tests for the Google Maps Distance Matrix commute client."""
 
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch
 
 import httpx
 
+from src.cache import ResponseCache
 from src.commute import get_commute_times
 
 
 DESTINATIONS = {"Work": "123 Office Dr, Manchester, NH", "Family": "456 Family Rd, Concord, NH"}
 
 
-def _mock_response(json_data, status_code=200):
-    resp = MagicMock(spec=httpx.Response)
-    resp.status_code = status_code
-    resp.json.return_value = json_data
-    resp.raise_for_status.return_value = None
-    return resp
-
-
 class TestGetCommuteTimes:
-    @patch("src.commute.httpx.get")
-    def test_successful_two_destinations(self, mock_get):
-        mock_get.return_value = _mock_response({
+    @patch("src.commute._CLIENT.get")
+    def test_successful_two_destinations(self, mock_get, make_response):
+        mock_get.return_value = make_response({
             "status": "OK",
             "rows": [{
                 "elements": [
@@ -33,9 +26,9 @@ class TestGetCommuteTimes:
         result = get_commute_times("408 Manchester Rd, Auburn, NH", DESTINATIONS, "test-key")
         assert result == {"Work": 32, "Family": 28}
 
-    @patch("src.commute.httpx.get")
-    def test_partial_failure_one_not_found(self, mock_get):
-        mock_get.return_value = _mock_response({
+    @patch("src.commute._CLIENT.get")
+    def test_partial_failure_one_not_found(self, mock_get, make_response):
+        mock_get.return_value = make_response({
             "status": "OK",
             "rows": [{
                 "elements": [
@@ -48,35 +41,30 @@ class TestGetCommuteTimes:
         assert result == {"Work": 32}
         assert "Family" not in result
 
-    @patch("src.commute.httpx.get")
-    def test_api_error_status(self, mock_get):
-        mock_get.return_value = _mock_response({
+    @patch("src.commute._CLIENT.get")
+    def test_api_error_status(self, mock_get, make_response):
+        mock_get.return_value = make_response({
             "status": "REQUEST_DENIED",
             "error_message": "Invalid key",
         })
         result = get_commute_times("408 Manchester Rd, Auburn, NH", DESTINATIONS, "bad-key")
         assert result == {}
 
-    @patch("src.commute.httpx.get")
+    @patch("src.commute._CLIENT.get")
     def test_network_error(self, mock_get):
         mock_get.side_effect = httpx.ConnectError("Connection refused")
         result = get_commute_times("408 Manchester Rd, Auburn, NH", DESTINATIONS, "test-key")
         assert result == {}
 
-    @patch("src.commute.httpx.get")
-    def test_http_error(self, mock_get):
-        resp = MagicMock(spec=httpx.Response)
-        resp.status_code = 500
-        resp.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "Server Error", request=MagicMock(), response=resp,
-        )
-        mock_get.return_value = resp
+    @patch("src.commute._CLIENT.get")
+    def test_http_error(self, mock_get, make_response):
+        mock_get.return_value = make_response({}, status_code=500)
         result = get_commute_times("408 Manchester Rd, Auburn, NH", DESTINATIONS, "test-key")
         assert result == {}
 
-    @patch("src.commute.httpx.get")
-    def test_single_api_call_for_multiple_destinations(self, mock_get):
-        mock_get.return_value = _mock_response({
+    @patch("src.commute._CLIENT.get")
+    def test_single_api_call_for_multiple_destinations(self, mock_get, make_response):
+        mock_get.return_value = make_response({
             "status": "OK",
             "rows": [{
                 "elements": [
@@ -95,9 +83,9 @@ class TestGetCommuteTimes:
         result = get_commute_times("408 Manchester Rd, Auburn, NH", {}, "test-key")
         assert result == {}
 
-    @patch("src.commute.httpx.get")
-    def test_rounding_seconds_to_minutes(self, mock_get):
-        mock_get.return_value = _mock_response({
+    @patch("src.commute._CLIENT.get")
+    def test_rounding_seconds_to_minutes(self, mock_get, make_response):
+        mock_get.return_value = make_response({
             "status": "OK",
             "rows": [{
                 "elements": [
@@ -112,3 +100,21 @@ class TestGetCommuteTimes:
         )
         # 1890 / 60 = 31.5, round = 32
         assert result == {"Work": 32}
+
+    @patch("src.commute._CLIENT.get")
+    def test_cache_hit_skips_request(self, mock_get, tmp_path, make_response):
+        cache = ResponseCache(tmp_path / "cache.sqlite", "commute", ttl=60)
+        mock_get.return_value = make_response({
+            "status": "OK",
+            "rows": [{
+                "elements": [
+                    {"status": "OK", "duration": {"value": 1920, "text": "32 mins"}},
+                    {"status": "OK", "duration": {"value": 1680, "text": "28 mins"}},
+                ],
+            }],
+        })
+        origin = "408 Manchester Rd, Auburn, NH"
+        first = get_commute_times(origin, DESTINATIONS, "test-key", cache=cache)
+        second = get_commute_times(origin, DESTINATIONS, "test-key", cache=cache)
+        assert first == second == {"Work": 32, "Family": 28}
+        assert mock_get.call_count == 1
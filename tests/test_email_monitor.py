@@ -1,19 +1,35 @@
 """Tests for the email monitor — listing data extraction from Zillow alert HTML."""
 
+import email
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+from functools import cache
 from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+from lxml import html as lxml_html
 
 from src.email_monitor import (
     ListingLink,
+    fetch_new_listing_urls,
+    _extract_address_from_block,
     _extract_listing_data_from_html,
     _extract_price_from_block,
     _address_from_url,
+    _find_html_section,
+    _get_html_body,
+    _html_from_raw,
+    _parse_sexp,
 )
 
 FIXTURES = Path(__file__).parent / "fixtures"
 
 
-def _load_real_email() -> str:
-    return (FIXTURES / "zillow_alert_email.html").read_text()
+@cache
+def _real_email_links() -> list[ListingLink]:
+    """Links parsed from fixtures/zillow_alert_email.html, read and parsed once per session."""
+    return _extract_listing_data_from_html((FIXTURES / "zillow_alert_email.html").read_text())
 
 
 # Minimal synthetic HTML where <a> hrefs contain direct Zillow URLs
@@ -49,11 +65,11 @@ class TestRealZillowEmail:
     """Tests against a saved real Zillow alert email."""
 
     def test_extracts_four_listings(self):
-        links = _extract_listing_data_from_html(_load_real_email())
+        links = _real_email_links()
         assert len(links) == 4
 
     def test_zpids_extracted(self):
-        links = _extract_listing_data_from_html(_load_real_email())
+        links = _real_email_links()
         zpids = {l.zpid for l in links}
         assert "86814380" in zpids
         assert "86808454" in zpids
@@ -61,20 +77,20 @@ class TestRealZillowEmail:
         assert "92866854" in zpids
 
     def test_addresses_extracted(self):
-        links = _extract_listing_data_from_html(_load_real_email())
+        links = _real_email_links()
         addresses = {l.zpid: l.address for l in links}
         assert "408 Manchester Road" in addresses["86814380"]
         assert "Auburn" in addresses["86814380"]
         assert "378 Chester Road" in addresses["86808454"]
 
     def test_urls_are_canonical_zillow(self):
-        links = _extract_listing_data_from_html(_load_real_email())
+        links = _real_email_links()
         for link in links:
             assert "zillow.com/homedetails/" in link.url
             assert link.url.endswith("_zpid/")
 
     def test_prices_extracted(self):
-        links = _extract_listing_data_from_html(_load_real_email())
+        links = _real_email_links()
         prices = {l.zpid: l.price for l in links}
         assert prices["86814380"] == 485000
         assert prices["86808454"] == 400000
@@ -82,10 +98,25 @@ class TestRealZillowEmail:
         assert prices["92866854"] == 325000
 
     def test_no_duplicates(self):
-        links = _extract_listing_data_from_html(_load_real_email())
+        links = _real_email_links()
         zpids = [l.zpid for l in links]
         assert len(zpids) == len(set(zpids))
 
+    @pytest.mark.parametrize("carrier", [
+        '<a data-href="{url}">View</a>',
+        '<img src="{url}" />',
+        '<p>{url}</p>',
+    ])
+    def test_url_outside_href(self, carrier):
+        url = "https://www.zillow.com/homedetails/1-Elm-St-Derry-NH/11112222_zpid/"
+        html = (
+            f'<table class="mw502"><tr><td>{carrier.format(url=url)}</td></tr>'
+            '<tr><td><h5>$250,000</h5></td></tr></table>'
+        )
+        (link,) = _extract_listing_data_from_html(html)
+        # The price only comes from the listing block, not the raw-URL fallback
+        assert (link.zpid, link.price) == ("11112222", 250000)
+
 
 class TestSyntheticEmail:
     """Tests with minimal synthetic HTML."""
@@ -123,70 +154,74 @@ class TestSyntheticEmail:
         assert len(zpids) == len(set(zpids))
 
 
-def _load_new_listing_email() -> str:
-    return (FIXTURES / "zillow_new_listing_email.html").read_text()
+@cache
+def _new_listing_links() -> list[ListingLink]:
+    """Links parsed from fixtures/zillow_new_listing_email.html, read and parsed once per session."""
+    return _extract_listing_data_from_html((FIXTURES / "zillow_new_listing_email.html").read_text())
 
 
 class TestNewListingEmail:
     """Tests against a saved real Zillow 'New Listing:' alert email."""
 
     def test_extracts_only_primary_listing(self):
-        links = _extract_listing_data_from_html(_load_new_listing_email())
+        links = _new_listing_links()
         assert len(links) == 1
 
     def test_primary_zpid(self):
-        links = _extract_listing_data_from_html(_load_new_listing_email())
+        links = _new_listing_links()
         assert links[0].zpid == "113449928"
 
     def test_primary_address(self):
-        links = _extract_listing_data_from_html(_load_new_listing_email())
+        links = _new_listing_links()
         assert "13 Birchdale Road" in links[0].address
         assert "Bow" in links[0].address
 
     def test_primary_price(self):
-        links = _extract_listing_data_from_html(_load_new_listing_email())
+        links = _new_listing_links()
         assert links[0].price == 479000
 
     def test_canonical_url(self):
-        links = _extract_listing_data_from_html(_load_new_listing_email())
+        links = _new_listing_links()
         assert links[0].url == "https://www.zillow.com/homedetails/113449928_zpid/"
 
     def test_excludes_recommendations(self):
         """The email has 6 'recommended' listings that should NOT be extracted."""
-        links = _extract_listing_data_from_html(_load_new_listing_email())
+        links = _new_listing_links()
         zpids = {l.zpid for l in links}
         # These are recommendation ZPIDs that should be excluded
         assert "117800723" not in zpids
         assert "124632182" not in zpids
 
 
-def _load_search_result_email() -> str:
-    return (FIXTURES / "zillow_search_result_email.html").read_text()
+@cache
+def _search_result_links() -> list[ListingLink]:
+    """Links parsed from fixtures/zillow_search_result_email.html, read and parsed once per session."""
+    return _extract_listing_data_from_html((FIXTURES / "zillow_search_result_email.html").read_text())
 
 
 class TestSearchResultEmail:
     """Tests against a saved real Zillow 'N Results for' search alert email."""
 
     def test_extracts_only_primary_listing(self):
-        links = _extract_listing_data_from_html(_load_search_result_email())
+        links = _search_result_links()
         assert len(links) == 1
 
     def test_primary_zpid(self):
-        links = _extract_listing_data_from_html(_load_search_result_email())
+        links = _search_result_links()
         assert links[0].zpid == "120666053"
 
     def test_primary_address(self):
-        links = _extract_listing_data_from_html(_load_search_result_email())
+        links = _search_result_links()
         assert "Molly Stark" in links[0].address
         assert "New Boston" in links[0].address
 
     def test_primary_price(self):
-        links = _extract_listing_data_from_html(_load_search_result_email())
+        links = _search_result_links()
         assert links[0].price == 460000
 
     def test_excludes_recommendations(self):
         """The email has 3 recommended listings that should NOT be extracted."""
-        links = _extract_listing_data_from_html(_load_search_result_email())
+        links = _search_result_links()
         zpids = {l.zpid for l in links}
         # These are recommendation ZPIDs that should be excluded
         assert "2090198051" not in zpids  # 2 Larch St condo
@@ -202,3 +237,140 @@ class TestAddressFromUrl:
 
     def test_returns_empty_for_bad_url(self):
         assert _address_from_url("https://example.com/") == ""
+
+
+class TestExtractAddressFromBlock:
+    def test_first_address_line(self):
+        block = lxml_html.fromstring(
+            "<div><p>$485,000</p><p> 408 Manchester Road, Auburn, NH 03032 </p><p>1 Elm St, Bow, NH</p></div>"
+        )
+        assert _extract_address_from_block(block) == "408 Manchester Road, Auburn, NH 03032"
+
+    def test_match_does_not_span_lines(self):
+        block = lxml_html.fromstring("<table><tr><td>3 bds</td><td>Main St, Auburn, NH</td></tr></table>")
+        assert _extract_address_from_block(block) == ""
+
+    def test_ignores_style_and_comments(self):
+        block = lxml_html.fromstring(
+            "<div><style>12 a, b, CC {}</style><!-- 1 Fake St, Nowhere, NH -->"
+            "<p>9 Oak Ave, Bow, NH</p></div>"
+        )
+        assert _extract_address_from_block(block) == "9 Oak Ave, Bow, NH"
+
+
+class TestExtractPriceFromBlock:
+    def test_price_from_h5(self):
+        block = lxml_html.fromstring("<table><tr><td><h5> $485,<b>000</b> </h5></td></tr></table>")
+        assert _extract_price_from_block(block) == 485000
+
+    def test_no_price(self):
+        block = lxml_html.fromstring("<table><tr><td><h5>Price TBD</h5></td></tr></table>")
+        assert _extract_price_from_block(block) == 0
+
+
+# BODYSTRUCTURE of a multipart/alternative message: plain text + HTML
+ALT_STRUCTURE = (
+    b'(("text" "plain" ("charset" "us-ascii") NIL NIL "7bit" 4 1 NIL NIL NIL)'
+    b'("text" "html" ("charset" "us-ascii") NIL NIL "7bit" 500 10 NIL NIL NIL)'
+    b' "alternative" ("boundary" "xyz") NIL NIL)'
+)
+
+
+def _raw_email(html: str, subject: str = "New Listing") -> bytes:
+    msg = MIMEMultipart("alternative")
+    msg["Subject"] = subject
+    msg.attach(MIMEText("text", "plain"))
+    msg.attach(MIMEText(html, "html"))
+    return msg.as_bytes()
+
+
+def _mock_imap(*raw_emails: bytes) -> MagicMock:
+    """IMAP double answering multi-message FETCHes with interleaved responses."""
+    messages = {str(i + 1).encode(): raw for i, raw in enumerate(raw_emails)}
+
+    def fetch(ids: bytes, spec: str):
+        data: list = []
+        for msg_id in ids.split(b","):
+            if spec == "(BODYSTRUCTURE)":
+                data.append(msg_id + b" (BODYSTRUCTURE " + ALT_STRUCTURE + b")")
+                continue
+            msg = email.message_from_bytes(messages[msg_id])
+            html = msg.get_payload()[1]
+            mime = "".join(f"{k}: {v}\r\n" for k, v in html.items()).encode() + b"\r\n"
+            data += [
+                (msg_id + b" (BODY[HEADER.FIELDS (SUBJECT)] {1}", f"Subject: {msg['Subject']}\r\n\r\n".encode()),
+                (b" BODY[2.MIME] {1}", mime),
+                (b" BODY[2] {1}", html.get_payload().encode()),
+                b")",
+            ]
+        return "OK", data
+
+    imap = MagicMock()
+    imap.search.return_value = ("OK", [b" ".join(messages)])
+    imap.fetch.side_effect = fetch
+    return imap
+
+
+class TestFetchNewListingUrls:
+    def test_batched_fetch_of_html_part_only(self):
+        imap = _mock_imap(_raw_email(SYNTHETIC_ALERT_HTML), _raw_email(SIMPLE_LINK_HTML))
+        links = fetch_new_listing_urls(imap)
+        assert {l.zpid for l in links} == {"87654321", "55555555"}
+        assert imap.fetch.call_count == 2
+        structure_call, body_call = imap.fetch.call_args_list
+        assert structure_call.args == (b"1,2", "(BODYSTRUCTURE)")
+        assert body_call.args[0] == b"1,2"
+        assert "BODY.PEEK[2]" in body_call.args[1]
+        imap.store.assert_called_once_with(b"1,2", "+FLAGS", "\\Seen")
+
+    def test_no_store_when_mark_read_disabled(self):
+        imap = _mock_imap(_raw_email(SYNTHETIC_ALERT_HTML))
+        fetch_new_listing_urls(imap, mark_read=False)
+        imap.store.assert_not_called()
+
+    def test_no_emails(self):
+        imap = MagicMock()
+        imap.search.return_value = ("OK", [b""])
+        assert fetch_new_listing_urls(imap) == []
+        imap.fetch.assert_not_called()
+
+
+class TestFindHtmlSection:
+    def test_alternative(self):
+        assert _find_html_section(_parse_sexp(ALT_STRUCTURE)[0]) == "2"
+
+    def test_nested_related_with_literal(self):
+        structure = (
+            b'((("text" "plain" NIL NIL NIL "7bit" 4 1 NIL NIL NIL)'
+            b'("text" "html" NIL NIL NIL "quoted-printable" 900 20 NIL NIL NIL) "alternative")'
+            b'("image" "png" ("name" {7}\r\nlogo"1\\) NIL NIL "base64" 100 NIL NIL NIL) "related")'
+        )
+        assert _find_html_section(_parse_sexp(structure)[0]) == "1.2"
+
+    def test_single_part_html(self):
+        structure = b'("text" "html" ("charset" "utf-8") NIL NIL "base64" 900 20 NIL NIL NIL)'
+        assert _find_html_section(_parse_sexp(structure)[0]) == ""
+
+    def test_no_html_part(self):
+        structure = b'("text" "plain" ("charset" "utf-8") NIL NIL "7bit" 10 1 NIL NIL NIL)'
+        assert _find_html_section(_parse_sexp(structure)[0]) is None
+
+
+class TestHtmlFromRaw:
+    def test_matches_full_parse(self):
+        raw = _raw_email(SYNTHETIC_ALERT_HTML)
+        assert _html_from_raw(raw) == _get_html_body(email.message_from_bytes(raw))
+
+    def test_base64_utf8_part(self):
+        html = "<p>Caf\u00e9 \u2014 $485,000</p>"
+        raw = _raw_email(html)
+        assert b"base64" in raw
+        assert _html_from_raw(raw) == html
+
+    def test_boundary_like_line_in_body(self):
+        html = "<style>\n--accent: red;\n</style><p>ok</p>"
+        assert _html_from_raw(_raw_email(html)) == html
+
+    def test_no_html_part(self):
+        raw = MIMEText("just text", "plain").as_bytes()
+        assert _html_from_raw(raw) is None
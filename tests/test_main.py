@@ -0,0 +1,35 @@
+"""Tests for the pipeline orchestrator."""
+
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+
+from src import main
+
+CONFIG = {"rentcast": {"api_key": "key"}}
+
+
+@pytest.fixture
+def conns(monkeypatch):
+    """Connections double with a Sheets client and an IMAP mailbox."""
+    monkeypatch.setattr(main, "ResponseCache", MagicMock())
+    conns = MagicMock(spec=main._Connections)
+    conns.imap.return_value.search.return_value = ("OK", [b"1"])
+    return conns
+
+
+class TestRunPipeline:
+    def test_listings_tab_failure_leaves_mailbox_untouched(self, conns):
+        conns.sheets.return_value.refresh_zpid_cache.side_effect = RuntimeError("tab setup failed")
+        main._run_pipeline(CONFIG, logging.getLogger("test"), "run", conns)
+        imap = conns.imap.return_value
+        imap.search.assert_not_called()
+        imap.store.assert_not_called()
+
+    def test_no_emails(self, conns):
+        conns.sheets.return_value.refresh_zpid_cache.return_value = {"1"}
+        conns.imap.return_value.search.return_value = ("OK", [b""])
+        main._run_pipeline(CONFIG, logging.getLogger("test"), "run", conns)
+        conns.imap.return_value.search.assert_called_once()
+        conns.sheets.return_value.add_listings.assert_not_called()
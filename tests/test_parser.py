@@ -1,5 +1,7 @@
 """Tests for the RentCast-to-Property parser."""
 
+import pytest
+
 from src.parser import Property, parse_from_rentcast, _most_recent_value
 
 # Sample RentCast /v1/properties response
@@ -43,13 +45,27 @@ SAMPLE_PROPERTY = {
 }
 
 
+# Variants of SAMPLE_PROPERTY, merged once at import
+HOA_150 = {**SAMPLE_PROPERTY, "hoa": {"fee": 150}}
+NO_FEATURES = {k: v for k, v in SAMPLE_PROPERTY.items() if k != "features"}
+
+
+def _with_features(**features) -> dict:
+    return {**SAMPLE_PROPERTY, "features": features}
+
+
+@pytest.fixture(scope="module")
+def prop() -> Property:
+    """SAMPLE_PROPERTY parsed once for the tests that only read its fields."""
+    return parse_from_rentcast(SAMPLE_PROPERTY, "1", "")
+
+
 class TestParseFromRentcast:
     def test_listing_price_from_email(self):
         prop = parse_from_rentcast(SAMPLE_PROPERTY, "1", "", listing_price=485000)
         assert prop.price == 485000
 
-    def test_last_sale_price_from_api(self):
-        prop = parse_from_rentcast(SAMPLE_PROPERTY, "1", "")
+    def test_last_sale_price_from_api(self, prop):
         assert prop.last_sale_price == 350000
         assert "2020-06-15" in prop.last_sale_date
 
@@ -69,12 +85,10 @@ class TestParseFromRentcast:
         assert prop.property_type == "Single Family"
         assert prop.hoa_monthly == 0
 
-    def test_lot_size_conversion(self):
-        prop = parse_from_rentcast(SAMPLE_PROPERTY, "1", "")
+    def test_lot_size_conversion(self, prop):
         assert 1.49 <= prop.lot_size_acres <= 1.51
 
-    def test_features(self):
-        prop = parse_from_rentcast(SAMPLE_PROPERTY, "1", "")
+    def test_features(self, prop):
         assert prop.has_garage is True
         assert prop.has_fireplace is True
         assert prop.has_basement is True
@@ -88,28 +102,24 @@ class TestParseFromRentcast:
         assert prop.exterior_type == "Vinyl"
         assert prop.roof_type == "Asphalt"
 
-    def test_location_fields(self):
-        prop = parse_from_rentcast(SAMPLE_PROPERTY, "1", "")
+    def test_location_fields(self, prop):
         assert prop.county == "Rockingham"
         assert prop.latitude == 43.0045
         assert prop.longitude == -71.3456
 
-    def test_tax_fields(self):
-        prop = parse_from_rentcast(SAMPLE_PROPERTY, "1", "")
+    def test_tax_fields(self, prop):
         assert prop.property_tax == 6800  # most recent year
         assert prop.tax_assessment == 380000
 
     def test_no_features_when_missing(self):
-        data = {k: v for k, v in SAMPLE_PROPERTY.items() if k != "features"}
-        prop = parse_from_rentcast(data, "1", "")
+        prop = parse_from_rentcast(NO_FEATURES, "1", "")
         assert prop.has_garage is None
         assert prop.has_fireplace is None
         assert prop.has_basement is None
         assert prop.garage_spaces == 0
 
     def test_hoa_fee_nested(self):
-        data = {**SAMPLE_PROPERTY, "hoa": {"fee": 150}}
-        prop = parse_from_rentcast(data, "1", "")
+        prop = parse_from_rentcast(HOA_150, "1", "")
         assert prop.hoa_monthly == 150
 
     def test_missing_fields_default_gracefully(self):
@@ -123,58 +133,30 @@ class TestParseFromRentcast:
         assert prop.lot_size_acres == 0.0
         assert prop.property_tax == 0
 
-    def test_basement_detection_case_insensitive(self):
-        data = {**SAMPLE_PROPERTY, "features": {
-            "foundationType": "WALK-OUT BASEMENT", "garage": False, "fireplace": False,
-        }}
-        prop = parse_from_rentcast(data, "1", "")
-        assert prop.has_basement is True
-
-    def test_no_basement_when_slab(self):
-        data = {**SAMPLE_PROPERTY, "features": {
-            "foundationType": "Slab", "garage": False, "fireplace": False,
-        }}
+    @pytest.mark.parametrize("data, field, expected", [
+        # Basement detection is case-insensitive
+        (_with_features(foundationType="WALK-OUT BASEMENT", garage=False, fireplace=False), "has_basement", True),
+        (_with_features(foundationType="Slab", garage=False, fireplace=False), "has_basement", False),
+        (_with_features(foundationType="Crawl Space", garage=False, fireplace=False), "has_basement", False),
+        # No foundation info → None (unknown)
+        (_with_features(garage=True, fireplace=False), "has_basement", None),
+        # garageSpaces > 0 implies garage even without explicit flag
+        (_with_features(garageSpaces=2), "has_garage", True),
+        # No garage flag or spaces → None (unknown)
+        (_with_features(foundationType="Slab"), "has_garage", None),
+        # No fireplace key at all → None
+        (_with_features(garage=True), "has_fireplace", None),
+    ])
+    def test_feature_variants(self, data, field, expected):
         prop = parse_from_rentcast(data, "1", "")
-        assert prop.has_basement is False
-
-    def test_garage_from_spaces_when_no_flag(self):
-        """garageSpaces > 0 implies garage even without explicit flag."""
-        data = {**SAMPLE_PROPERTY, "features": {"garageSpaces": 2}}
-        prop = parse_from_rentcast(data, "1", "")
-        assert prop.has_garage is True
-
-    def test_garage_none_when_no_signal(self):
-        """No garage flag or spaces → None (unknown)."""
-        data = {**SAMPLE_PROPERTY, "features": {"foundationType": "Slab"}}
-        prop = parse_from_rentcast(data, "1", "")
-        assert prop.has_garage is None
-
-    def test_fireplace_none_when_missing(self):
-        """No fireplace key at all → None."""
-        data = {**SAMPLE_PROPERTY, "features": {"garage": True}}
-        prop = parse_from_rentcast(data, "1", "")
-        assert prop.has_fireplace is None
-
-    def test_basement_none_when_no_foundation(self):
-        """No foundation info → None (unknown)."""
-        data = {**SAMPLE_PROPERTY, "features": {"garage": True, "fireplace": False}}
-        prop = parse_from_rentcast(data, "1", "")
-        assert prop.has_basement is None
-
-    def test_basement_false_for_crawl_space(self):
-        data = {**SAMPLE_PROPERTY, "features": {
-            "foundationType": "Crawl Space", "garage": False, "fireplace": False,
-        }}
-        prop = parse_from_rentcast(data, "1", "")
-        assert prop.has_basement is False
+        assert getattr(prop, field) is expected
 
     def test_listing_url_preserved(self):
         url = "https://www.zillow.com/homedetails/test/12345_zpid/"
         prop = parse_from_rentcast(SAMPLE_PROPERTY, "12345", url)
         assert prop.listing_url == url
 
-    def test_commute_minutes_defaults_to_empty_dict(self):
-        prop = parse_from_rentcast(SAMPLE_PROPERTY, "1", "")
+    def test_commute_minutes_defaults_to_empty_dict(self, prop):
         assert prop.commute_minutes == {}
 
     def test_commute_minutes_can_be_set(self):
@@ -184,12 +166,10 @@ class TestParseFromRentcast:
 
 
 class TestMostRecentValue:
-    def test_picks_latest_year(self):
-        taxes = {"2023": {"total": 6500}, "2024": {"total": 6800}}
-        assert _most_recent_value(taxes, "total") == 6800
-
-    def test_returns_zero_for_none(self):
-        assert _most_recent_value(None, "total") == 0
-
-    def test_returns_zero_for_empty(self):
-        assert _most_recent_value({}, "total") == 0
+    @pytest.mark.parametrize("yearly, expected", [
+        ({"2023": {"total": 6500}, "2024": {"total": 6800}}, 6800),  # latest year wins
+        (None, 0),
+        ({}, 0),
+    ])
+    def test_most_recent_value(self, yearly, expected):
+        assert _most_recent_value(yearly, "total") == expected
@@ -1,24 +1,14 @@
 """Tests for the RentCast API client."""
 
-from unittest.mock import patch, MagicMock
+from unittest.mock import MagicMock
 
 import httpx
+import pytest
 
+from src.cache import ResponseCache
 from src.rentcast import lookup_property
 
 
-def _mock_response(status_code: int = 200, json_data=None):
-    resp = MagicMock(spec=httpx.Response)
-    resp.status_code = status_code
-    resp.json.return_value = json_data
-    resp.raise_for_status = MagicMock()
-    if status_code >= 400:
-        resp.raise_for_status.side_effect = httpx.HTTPStatusError(
-            "error", request=MagicMock(), response=resp
-        )
-    return resp
-
-
 SAMPLE_RESPONSE = [
     {
         "id": "def456",
@@ -34,10 +24,17 @@ SAMPLE_RESPONSE = [
 ]
 
 
+@pytest.fixture
+def mock_get(monkeypatch) -> MagicMock:
+    """Stand-in for the shared client's get; tests set its return value."""
+    get = MagicMock()
+    monkeypatch.setattr("src.rentcast._CLIENT.get", get)
+    return get
+
+
 class TestLookupProperty:
-    @patch("src.rentcast.httpx.get")
-    def test_returns_first_result(self, mock_get):
-        mock_get.return_value = _mock_response(200, SAMPLE_RESPONSE)
+    def test_returns_first_result(self, mock_get, make_response):
+        mock_get.return_value = make_response(SAMPLE_RESPONSE)
         result = lookup_property("408 Manchester Road, Auburn, NH", "test-key")
         assert result is not None
         assert result["bedrooms"] == 3
@@ -45,26 +42,44 @@ class TestLookupProperty:
         call_kwargs = mock_get.call_args
         assert call_kwargs.kwargs["headers"]["X-Api-Key"] == "test-key"
 
-    @patch("src.rentcast.httpx.get")
-    def test_returns_none_on_empty_list(self, mock_get):
-        mock_get.return_value = _mock_response(200, [])
+    def test_returns_none_on_empty_list(self, mock_get, make_response):
+        mock_get.return_value = make_response([])
         result = lookup_property("Nowhere, XX", "test-key")
         assert result is None
 
-    @patch("src.rentcast.httpx.get")
-    def test_returns_none_on_404(self, mock_get):
-        mock_get.return_value = _mock_response(404, None)
+    def test_returns_none_on_404(self, mock_get, make_response):
+        mock_get.return_value = make_response(None, 404)
         result = lookup_property("Nowhere, XX", "test-key")
         assert result is None
 
-    @patch("src.rentcast.httpx.get")
-    def test_returns_none_on_500(self, mock_get):
-        mock_get.return_value = _mock_response(500, None)
+    def test_returns_none_on_500(self, mock_get, make_response):
+        mock_get.return_value = make_response(None, 500)
         result = lookup_property("Test", "test-key")
         assert result is None
 
-    @patch("src.rentcast.httpx.get")
     def test_returns_none_on_network_error(self, mock_get):
         mock_get.side_effect = httpx.ConnectError("connection failed")
         result = lookup_property("Test", "test-key")
         assert result is None
+
+    def test_uses_supplied_client(self, make_response):
+        client = MagicMock(spec=httpx.Client)
+        client.get.return_value = make_response(SAMPLE_RESPONSE)
+        result = lookup_property("408 Manchester Road, Auburn, NH", "test-key", client=client)
+        assert result is not None
+        client.get.assert_called_once()
+
+    def test_cache_hit_skips_request(self, mock_get, tmp_path, make_response):
+        cache = ResponseCache(tmp_path / "cache.sqlite", "rentcast", ttl=60)
+        mock_get.return_value = make_response(SAMPLE_RESPONSE)
+        first = lookup_property("408 Manchester Road, Auburn, NH", "test-key", cache=cache)
+        second = lookup_property("408  manchester road, auburn, NH", "test-key", cache=cache)
+        assert second == first
+        assert mock_get.call_count == 1
+
+    def test_failures_not_cached(self, mock_get, tmp_path, make_response):
+        cache = ResponseCache(tmp_path / "cache.sqlite", "rentcast", ttl=60)
+        mock_get.return_value = make_response(None, 404)
+        lookup_property("Nowhere, XX", "test-key", cache=cache)
+        lookup_property("Nowhere, XX", "test-key", cache=cache)
+        assert mock_get.call_count == 2
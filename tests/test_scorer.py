@@ -1,11 +1,21 @@
 """Tests for the property scoring engine."""
 
+import os
+from dataclasses import replace
+from functools import cache
+from types import MappingProxyType
+
+import pytest
+
 from src.parser import Property
 from src.scorer import (
     ScoreBreakdown,
+    compile_scoring_config,
+    load_scoring_config,
+    score_properties,
     score_property,
-    _normalize_threshold,
-    _normalize_peak,
+    _peak_scorer,
+    _threshold_scorer,
 )
 
 SAMPLE_CONFIG = {
@@ -45,39 +55,54 @@ SAMPLE_CONFIG = {
 }
 
 
+def _frozen(mapping: dict) -> MappingProxyType:
+    return MappingProxyType({
+        k: _frozen(v) if isinstance(v, dict) else v for k, v in mapping.items()
+    })
+
+
+# Read-only so no test can change what the others score against. Most tests
+# pass the compiled form; TestCompiledConfig and TestScoreProperties keep
+# the raw-dict path covered.
+SAMPLE_CONFIG = _frozen(SAMPLE_CONFIG)
+SAMPLE_COMPILED = compile_scoring_config(SAMPLE_CONFIG)
+
+
+# Shared by every _make_property() result; read-only so no test can leak changes
+_BASE_PROPERTY = Property(
+    zpid="111",
+    address="123 Test St",
+    price=300000,
+    bedrooms=3,
+    bathrooms=2.0,
+    sqft=1800,
+    lot_size_acres=3.0,
+    year_built=2000,
+    hoa_monthly=0,
+    has_garage=None,
+    has_basement=None,
+    has_fireplace=None,
+    property_type="SINGLE_FAMILY",
+    commute_minutes=MappingProxyType({"Work": 15, "School": 20}),
+)
+
+
 def _make_property(**overrides) -> Property:
-    defaults = dict(
-        zpid="111",
-        address="123 Test St",
-        price=300000,
-        bedrooms=3,
-        bathrooms=2.0,
-        sqft=1800,
-        lot_size_acres=3.0,
-        year_built=2000,
-        hoa_monthly=0,
-        has_garage=None,
-        has_basement=None,
-        has_fireplace=None,
-        property_type="SINGLE_FAMILY",
-        commute_minutes={"Work": 15, "School": 20},
-    )
-    defaults.update(overrides)
-    return Property(**defaults)
+    return replace(_BASE_PROPERTY, **overrides)
 
 
 class TestScoring:
     def test_returns_score_breakdown(self):
         prop = _make_property()
-        result = score_property(prop, config=SAMPLE_CONFIG)
+        result = score_property(prop, config=SAMPLE_COMPILED)
         assert isinstance(result, ScoreBreakdown)
         assert 0 <= result.final_score <= 100
 
     def test_more_land_is_better(self):
         big_lot = _make_property(lot_size_acres=5.0)
         small_lot = _make_property(lot_size_acres=1.0)
-        s_big = score_property(big_lot, config=SAMPLE_CONFIG)
-        s_small = score_property(small_lot, config=SAMPLE_CONFIG)
+        s_big = score_property(big_lot, config=SAMPLE_COMPILED)
+        s_small = score_property(small_lot, config=SAMPLE_COMPILED)
         assert s_big.final_score > s_small.final_score
 
     def test_bonus_features_add_points(self):
@@ -87,15 +112,15 @@ class TestScoring:
             lot_size_acres=0.6, commute_minutes={"Work": 40},
             has_garage=True, has_basement=True, has_fireplace=True,
         )
-        s_none = score_property(no_bonus, config=SAMPLE_CONFIG)
-        s_all = score_property(all_bonus, config=SAMPLE_CONFIG)
+        s_none = score_property(no_bonus, config=SAMPLE_COMPILED)
+        s_all = score_property(all_bonus, config=SAMPLE_COMPILED)
         assert s_all.final_score - s_none.final_score == 23.0
 
     def test_garage_bonus_is_15(self):
         no_garage = _make_property()
         with_garage = _make_property(has_garage=True)
-        s_no = score_property(no_garage, config=SAMPLE_CONFIG)
-        s_yes = score_property(with_garage, config=SAMPLE_CONFIG)
+        s_no = score_property(no_garage, config=SAMPLE_COMPILED)
+        s_yes = score_property(with_garage, config=SAMPLE_COMPILED)
         assert s_yes.final_score - s_no.final_score == 15.0
 
     def test_score_capped_at_100(self):
@@ -109,7 +134,7 @@ class TestScoring:
             has_basement=True,
             has_fireplace=True,
         )
-        result = score_property(perfect, config=SAMPLE_CONFIG)
+        result = score_property(perfect, config=SAMPLE_COMPILED)
         assert result.final_score == 100.0
 
     def test_score_not_negative(self):
@@ -120,19 +145,19 @@ class TestScoring:
             bathrooms=0,
             commute_minutes={"Work": 60},
         )
-        result = score_property(worst, config=SAMPLE_CONFIG)
+        result = score_property(worst, config=SAMPLE_COMPILED)
         assert result.final_score >= 0
 
     def test_missing_data_not_penalized(self):
         full = _make_property()
         partial = _make_property(bathrooms=0)
-        s_full = score_property(full, config=SAMPLE_CONFIG)
-        s_partial = score_property(partial, config=SAMPLE_CONFIG)
+        s_full = score_property(full, config=SAMPLE_COMPILED)
+        s_partial = score_property(partial, config=SAMPLE_COMPILED)
         assert s_partial.final_score > 0
 
     def test_summary_string(self):
         prop = _make_property(has_garage=True)
-        result = score_property(prop, config=SAMPLE_CONFIG)
+        result = score_property(prop, config=SAMPLE_COMPILED)
         summary = result.summary()
         assert "lot_size_acres" in summary
         assert "+has_garage" in summary
@@ -140,7 +165,7 @@ class TestScoring:
     def test_sqft_and_year_not_scored(self):
         """sqft and year_built should not appear in criterion scores."""
         prop = _make_property()
-        result = score_property(prop, config=SAMPLE_CONFIG)
+        result = score_property(prop, config=SAMPLE_COMPILED)
         assert "sqft" not in result.criterion_scores
         assert "year_built" not in result.criterion_scores
 
@@ -148,160 +173,107 @@ class TestScoring:
         """None (unknown) bonus features should award 0 points, same as False."""
         no_bonus = _make_property(has_garage=False, has_basement=False, has_fireplace=False)
         unknown = _make_property(has_garage=None, has_basement=None, has_fireplace=None)
-        s_no = score_property(no_bonus, config=SAMPLE_CONFIG)
-        s_unknown = score_property(unknown, config=SAMPLE_CONFIG)
+        s_no = score_property(no_bonus, config=SAMPLE_COMPILED)
+        s_unknown = score_property(unknown, config=SAMPLE_COMPILED)
         assert s_no.final_score == s_unknown.final_score
         assert s_unknown.bonus_total == 0.0
 
 
+@cache
+def _bed_score(bedrooms: int) -> ScoreBreakdown:
+    """SAMPLE_CONFIG score of the base property with `bedrooms`, computed once per value."""
+    return score_property(_make_property(bedrooms=bedrooms), config=SAMPLE_COMPILED)
+
+
+@cache
+def _commute_score(work: int, school: int | None = None) -> ScoreBreakdown:
+    """SAMPLE_CONFIG score of the base property with these commutes, computed once per input."""
+    commutes = {"Work": work} if school is None else {"Work": work, "School": school}
+    return score_property(_make_property(commute_minutes=commutes), config=SAMPLE_COMPILED)
+
+
 class TestBedroomPeakScoring:
     def test_3_beds_scores_highest(self):
-        two = _make_property(bedrooms=2)
-        three = _make_property(bedrooms=3)
-        four = _make_property(bedrooms=4)
-        s2 = score_property(two, config=SAMPLE_CONFIG)
-        s3 = score_property(three, config=SAMPLE_CONFIG)
-        s4 = score_property(four, config=SAMPLE_CONFIG)
-        assert s3.final_score > s2.final_score
-        assert s3.final_score > s4.final_score
-
-    def test_3_beds_gets_100_normalized(self):
-        prop = _make_property(bedrooms=3)
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        assert result.criterion_scores["bedrooms"] == 100.0
-
-    def test_2_beds_gets_50_normalized(self):
-        prop = _make_property(bedrooms=2)
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        assert result.criterion_scores["bedrooms"] == 50.0
-
-    def test_4_beds_gets_50_normalized(self):
-        prop = _make_property(bedrooms=4)
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        assert result.criterion_scores["bedrooms"] == 50.0
-
-    def test_5_beds_gets_zero(self):
-        prop = _make_property(bedrooms=5)
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        assert result.criterion_scores["bedrooms"] == 0.0
+        assert _bed_score(3).final_score > _bed_score(2).final_score
+        assert _bed_score(3).final_score > _bed_score(4).final_score
+
+    @pytest.mark.parametrize("bedrooms, expected", [(3, 100.0), (2, 50.0), (4, 50.0), (5, 0.0)])
+    def test_normalized(self, bedrooms, expected):
+        assert _bed_score(bedrooms).criterion_scores["bedrooms"] == expected
 
 
 class TestCommuteScoring:
     def test_shorter_commute_scores_higher(self):
-        close = _make_property(commute_minutes={"Work": 10, "School": 15})
-        far = _make_property(commute_minutes={"Work": 35, "School": 40})
-        s_close = score_property(close, config=SAMPLE_CONFIG)
-        s_far = score_property(far, config=SAMPLE_CONFIG)
-        assert s_close.final_score > s_far.final_score
-
-    def test_threshold_full_points_under_20(self):
-        prop = _make_property(commute_minutes={"Work": 15})
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        assert result.criterion_scores["commute"] == 100.0
-
-    def test_threshold_zero_points_at_46(self):
-        prop = _make_property(commute_minutes={"Work": 46})
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        assert result.criterion_scores["commute"] == 0.0
-
-    def test_threshold_partial_zone(self):
-        prop = _make_property(commute_minutes={"Work": 33})
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        # (46 - 33) / (46 - 20) * 100 = 50.0
-        assert result.criterion_scores["commute"] == 50.0
+        assert _commute_score(10, 15).final_score > _commute_score(35, 40).final_score
+
+    @pytest.mark.parametrize("work, expected", [
+        (15, 100.0),  # full points under 20
+        (46, 0.0),  # zero points at 46
+        (33, 50.0),  # (46 - 33) / (46 - 20) * 100
+    ])
+    def test_threshold(self, work, expected):
+        assert _commute_score(work).criterion_scores["commute"] == expected
 
     def test_45_min_gets_minimal_points(self):
-        prop = _make_property(commute_minutes={"Work": 45})
-        result = score_property(prop, config=SAMPLE_CONFIG)
         # (46 - 45) / (46 - 20) * 100 = 3.8
-        assert 3 <= result.criterion_scores["commute"] <= 5
+        assert 3 <= _commute_score(45).criterion_scores["commute"] <= 5
 
     def test_worst_destination_used(self):
-        prop = _make_property(commute_minutes={"Work": 10, "School": 40})
-        result = score_property(prop, config=SAMPLE_CONFIG)
         # Worst is 40: (46-40)/(46-20)*100 = 23.1
-        assert 20 <= result.criterion_scores["commute"] <= 25
+        assert 20 <= _commute_score(10, 40).criterion_scores["commute"] <= 25
 
     def test_missing_commute_not_penalized(self):
         prop = _make_property(commute_minutes={})
-        result = score_property(prop, config=SAMPLE_CONFIG)
+        result = score_property(prop, config=SAMPLE_COMPILED)
         assert "commute" not in result.criterion_scores
         assert result.final_score > 0
 
 
+@cache
+def _price_score(price: int) -> ScoreBreakdown:
+    """SAMPLE_CONFIG score of the base property at `price`, computed once per value."""
+    return score_property(_make_property(price=price), config=SAMPLE_COMPILED)
+
+
 class TestValueRatio:
-    def test_value_ratio_computed(self):
-        prop = _make_property(price=200000)
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        # Ratio is computed from unrounded final_score internally, so check approx
-        expected = result.final_score / 2.0
-        assert abs(result.value_ratio - expected) < 0.15
+    @pytest.mark.parametrize("price, per_100k", [(200000, 2.0), (300000, 3.0)])
+    def test_ratio_is_score_per_100k(self, price, per_100k):
+        result = _price_score(price)
+        # Ratio is computed from the unrounded final score, so only approximately
+        # equal to the rounded final_score / (price / 100k)
+        assert result.value_ratio == pytest.approx(result.final_score / per_100k, abs=0.15)
 
     def test_cheaper_house_higher_ratio(self):
-        cheap = _make_property(price=150000)
-        expensive = _make_property(price=450000)
-        s_cheap = score_property(cheap, config=SAMPLE_CONFIG)
-        s_expensive = score_property(expensive, config=SAMPLE_CONFIG)
-        assert s_cheap.value_ratio > s_expensive.value_ratio
+        assert _price_score(150000).value_ratio > _price_score(450000).value_ratio
 
     def test_zero_price_gives_zero_ratio(self):
-        prop = _make_property(price=0)
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        assert result.value_ratio == 0.0
-
-    def test_ratio_is_score_per_100k(self):
-        prop = _make_property(price=300000)
-        result = score_property(prop, config=SAMPLE_CONFIG)
-        expected = result.final_score / 3.0
-        assert abs(result.value_ratio - expected) < 0.15
-
-
-class TestNormalizeThreshold:
-    def test_under_full_points(self):
-        cfg = {"full_points_under": 20, "zero_points_over": 46}
-        assert _normalize_threshold(10, cfg) == 100.0
-        assert _normalize_threshold(20, cfg) == 100.0
-
-    def test_over_zero_points(self):
-        cfg = {"full_points_under": 20, "zero_points_over": 46}
-        assert _normalize_threshold(46, cfg) == 0.0
-        assert _normalize_threshold(60, cfg) == 0.0
+        assert _price_score(0).value_ratio == 0.0
 
-    def test_partial_zone_midpoint(self):
-        cfg = {"full_points_under": 20, "zero_points_over": 46}
-        assert _normalize_threshold(33, cfg) == 50.0
 
+THRESHOLD_CFG = {"full_points_under": 20, "zero_points_over": 46}
+PEAK_CFG = {"ideal": 3, "min": 1, "max": 5}
 
-class TestNormalizePeak:
-    def test_at_ideal(self):
-        cfg = {"ideal": 3, "min": 1, "max": 5}
-        assert _normalize_peak(3, cfg) == 100.0
 
-    def test_at_min(self):
-        cfg = {"ideal": 3, "min": 1, "max": 5}
-        assert _normalize_peak(1, cfg) == 0.0
+class TestThresholdScorer:
+    @pytest.mark.parametrize("value, expected", [
+        (10, 100.0), (20, 100.0),  # at or under full_points_under
+        (46, 0.0), (60, 0.0),  # at or over zero_points_over
+        (33, 50.0),  # partial zone midpoint
+    ])
+    def test_threshold(self, value, expected):
+        assert _threshold_scorer(THRESHOLD_CFG)(value) == expected
 
-    def test_at_max(self):
-        cfg = {"ideal": 3, "min": 1, "max": 5}
-        assert _normalize_peak(5, cfg) == 0.0
 
-    def test_below_min(self):
-        cfg = {"ideal": 3, "min": 1, "max": 5}
-        assert _normalize_peak(0, cfg) == 0.0
-
-    def test_above_max(self):
-        cfg = {"ideal": 3, "min": 1, "max": 5}
-        assert _normalize_peak(6, cfg) == 0.0
-
-    def test_left_side_midpoint(self):
-        cfg = {"ideal": 3, "min": 1, "max": 5}
-        # 2 is halfway between min=1 and ideal=3
-        assert _normalize_peak(2, cfg) == 50.0
-
-    def test_right_side_midpoint(self):
-        cfg = {"ideal": 3, "min": 1, "max": 5}
-        # 4 is halfway between ideal=3 and max=5
-        assert _normalize_peak(4, cfg) == 50.0
+class TestPeakScorer:
+    @pytest.mark.parametrize("value, expected", [
+        (3, 100.0),  # at ideal
+        (1, 0.0), (5, 0.0),  # at min / max
+        (0, 0.0), (6, 0.0),  # outside the range
+        (2, 50.0),  # halfway between min=1 and ideal=3
+        (4, 50.0),  # halfway between ideal=3 and max=5
+    ])
+    def test_peak(self, value, expected):
+        assert _peak_scorer(PEAK_CFG)(value) == expected
 
 
 class TestHandCalculatedScore:
@@ -317,5 +289,66 @@ class TestHandCalculatedScore:
         #              = 8224 / 100 = 82.2
 
         prop = _make_property()
-        result = score_property(prop, config=SAMPLE_CONFIG)
+        result = score_property(prop, config=SAMPLE_COMPILED)
         assert 81 <= result.weighted_average <= 84
+
+
+class TestCompiledConfig:
+    def test_matches_raw_config(self):
+        compiled = compile_scoring_config(SAMPLE_CONFIG)
+        for overrides in ({}, {"has_garage": True}, {"commute_minutes": {}}, {"bedrooms": 6, "price": 0}):
+            prop = _make_property(**overrides)
+            assert score_property(prop, config=compiled) == score_property(prop, config=SAMPLE_CONFIG)
+
+    def test_unknown_criterion_skipped(self):
+        config = {"criteria": {"acreage": {"weight": 10, "min": 0, "max": 1}}, "bonuses": {}}
+        result = score_property(_make_property(), config=compile_scoring_config(config))
+        assert result.criterion_scores == {}
+        assert result.weighted_average == 0.0
+
+
+class TestScoreProperties:
+    def test_matches_per_property_scoring(self):
+        props = [_make_property(), _make_property(lot_size_acres=0.5, price=250000)]
+        assert score_properties(props, config=SAMPLE_CONFIG) == [
+            score_property(p, config=SAMPLE_COMPILED) for p in props
+        ]
+
+    @pytest.mark.parametrize("n", [1, 100, 1000])
+    def test_matches_per_property_scoring_at_scale(self, n):
+        props = [
+            _make_property(
+                zpid=str(i),
+                price=150000 + 1000 * i,
+                lot_size_acres=(i % 60) / 10,
+                bedrooms=i % 7,
+                bathrooms=(i % 5) / 2,
+                commute_minutes={"Work": 10 + i % 45} if i % 4 else {},
+                has_garage=(None, True, False)[i % 3],
+                has_basement=i % 2 == 0,
+            )
+            for i in range(n)
+        ]
+        assert score_properties(props, config=SAMPLE_CONFIG) == [
+            score_property(p, config=SAMPLE_COMPILED) for p in props
+        ]
+
+    def test_empty(self):
+        assert score_properties([], config=SAMPLE_COMPILED) == []
+
+
+class TestLoadScoringConfig:
+    def test_parsed_once_while_unchanged(self, tmp_path):
+        path = tmp_path / "scoring.yaml"
+        path.write_text("criteria: {}\nbonuses: {}\n")
+        assert load_scoring_config(path) is load_scoring_config(path)
+
+    def test_reloaded_after_edit(self, tmp_path):
+        path = tmp_path / "scoring.yaml"
+        path.write_text("bonuses: {}\n")
+        first = load_scoring_config(path)
+        path.write_text("bonuses: {has_garage: {points: 15}}\n")
+        st = os.stat(path)
+        os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+        assert load_scoring_config(path)["bonuses"] == {"has_garage": {"points": 15}}
+        assert first == {"bonuses": {}}
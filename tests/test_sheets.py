@@ -0,0 +1,430 @@
+"""Tests for the Google Sheets row helpers (no API access)."""
+
+import json
+from unittest.mock import MagicMock, patch
+
+import gspread
+import pytest
+
+from src.parser import Property
+from src.scorer import ScoreBreakdown
+from src.sheets import (
+    LISTINGS_HEADERS,
+    LISTINGS_HEADERS_VERSION,
+    SheetsClient,
+    build_listing_row,
+    build_score_row,
+    _build_scores_headers,
+    _changed_row_runs,
+    _col_letter,
+    _tier_color_requests,
+    _with_retry,
+)
+
+
+def _make_property(**overrides) -> Property:
+    defaults = dict(
+        zpid="12345678",
+        address="408 Manchester Rd, Auburn, NH 03032",
+        town="Auburn",
+        price=485000,
+        bedrooms=3,
+        bathrooms=2.0,
+        lot_size_acres=1.5,
+        has_garage=True,
+        has_basement=False,
+        has_fireplace=None,
+        has_pool=False,
+        commute_minutes={"Work": 32, "School": 28},
+    )
+    defaults.update(overrides)
+    return Property(**defaults)
+
+
+class TestBuildListingRow:
+    def test_row_matches_headers(self):
+        row = build_listing_row(_make_property())
+        assert len(row) == len(LISTINGS_HEADERS)
+
+    def test_values_in_header_order(self):
+        cells = dict(zip(LISTINGS_HEADERS, build_listing_row(_make_property())))
+        assert cells["ZPID"] == "12345678"
+        assert cells["Listing Price"] == 485000
+        assert cells["Status"] == ""
+        assert json.loads(cells["Commutes"]) == {"Work": 32, "School": 28}
+
+    def test_three_valued_bools(self):
+        cells = dict(zip(LISTINGS_HEADERS, build_listing_row(_make_property())))
+        assert cells["Garage"] == "Yes"
+        assert cells["Basement"] == "No"
+        assert cells["Fireplace"] == ""
+        assert cells["Pool"] == "No"
+
+    def test_date_added(self):
+        cells = dict(zip(LISTINGS_HEADERS, build_listing_row(_make_property(), "2024-05-01")))
+        assert cells["Date Added"] == "2024-05-01"
+
+    def test_empty_commutes(self):
+        cells = dict(zip(LISTINGS_HEADERS, build_listing_row(_make_property(commute_minutes={}))))
+        assert cells["Commutes"] == ""
+
+
+def _breakdown(ratio: float) -> ScoreBreakdown:
+    return ScoreBreakdown(
+        criterion_scores={"lot_size_acres": 50.0},
+        bonus_scores={},
+        weighted_average=50.0,
+        bonus_total=0.0,
+        final_score=50.0,
+        value_ratio=ratio,
+    )
+
+
+class TestBuildScoreRow:
+    def test_matches_headers(self):
+        labels = ["Work", "School", "Gym"]
+        row = build_score_row(_make_property(), _breakdown(20.0), labels)
+        cells = dict(zip(_build_scores_headers(labels), row))
+        assert len(row) == len(_build_scores_headers(labels))
+        assert cells["Value Ratio"] == 20.0
+        assert (cells["Commute (Work)"], cells["Commute (Gym)"]) == (32, "")
+        assert cells["Garage"] == "Yes"
+        assert cells["ZPID"] == "12345678"
+
+
+def _client_with_scores_tab(existing: list[list]) -> tuple[SheetsClient, MagicMock]:
+    """SheetsClient wired to a mock Scores worksheet, bypassing auth."""
+    client = SheetsClient.__new__(SheetsClient)
+    client.scores_tab_name = "Scores"
+    client._tabs = {}
+    ws = MagicMock()
+    ws.id, ws.row_count, ws.col_count = 7, 1000, 26
+    ws.get_all_values.return_value = existing
+    client.spreadsheet = MagicMock()
+    client.spreadsheet.worksheet.return_value = ws
+    return client, ws
+
+
+def _requests(client: SheetsClient, kind: str) -> list[dict]:
+    """Requests of one kind from the client's single spreadsheet batch_update."""
+    (body,), _ = client.spreadsheet.batch_update.call_args
+    return [r for r in body["requests"] if kind in r]
+
+
+def _client_with_listings_tab(zpids: list[str]) -> tuple[SheetsClient, MagicMock]:
+    """SheetsClient wired to a mock Listings worksheet holding `zpids`, bypassing auth."""
+    client = SheetsClient.__new__(SheetsClient)
+    client._zpids = None
+    ws = MagicMock()
+    ws.col_values.return_value = ["ZPID", *zpids]
+    client.listings_ws = ws
+    return client, ws
+
+
+def _client_for_header_check(marker_dir) -> tuple[SheetsClient, MagicMock]:
+    """SheetsClient with a mock spreadsheet whose Listings tab has current headers."""
+    client = SheetsClient.__new__(SheetsClient)
+    client.listings_tab_name = "Listings"
+    client._tabs = {}
+    client._header_marker = marker_dir / "sheet-id.headers"
+    ws = MagicMock()
+    ws.row_values.return_value = list(LISTINGS_HEADERS)
+    client.spreadsheet = MagicMock()
+    client.spreadsheet.worksheet.return_value = ws
+    return client, ws
+
+
+class TestEnsureListingsTab:
+    def test_marker_skips_header_fetch(self, tmp_path):
+        client, ws = _client_for_header_check(tmp_path)
+        client._ensure_listings_tab()
+        ws.row_values.assert_called_once_with(1)
+        assert client._header_marker.read_text().strip() == LISTINGS_HEADERS_VERSION
+
+        client._ensure_listings_tab()
+        ws.row_values.assert_called_once_with(1)
+
+    def test_set_up_lazily_once(self, tmp_path):
+        client, ws = _client_for_header_check(tmp_path)
+        client.spreadsheet.worksheet.assert_not_called()
+        assert client.listings_ws is ws
+        assert client.listings_ws is ws
+        client.spreadsheet.worksheet.assert_called_once_with("Listings")
+
+    def test_stale_marker_rechecks(self, tmp_path):
+        client, ws = _client_for_header_check(tmp_path)
+        client._header_marker.write_text("old-layout\n")
+        client._ensure_listings_tab()
+        ws.row_values.assert_called_once_with(1)
+
+    def test_new_tab_ignores_marker(self, tmp_path):
+        client, ws = _client_for_header_check(tmp_path)
+        client._header_marker.write_text(LISTINGS_HEADERS_VERSION)
+        client.spreadsheet.worksheet.side_effect = gspread.exceptions.WorksheetNotFound
+        client.spreadsheet.add_worksheet.return_value = ws
+        ws.row_values.return_value = []
+        client._ensure_listings_tab()
+        ws.update.assert_called_once_with("A1", [LISTINGS_HEADERS])
+
+    @patch("src.sheets.time.sleep")
+    def test_add_tab_not_resent_on_server_error(self, sleep, tmp_path):
+        client, _ = _client_for_header_check(tmp_path)
+        client.spreadsheet.worksheet.side_effect = gspread.exceptions.WorksheetNotFound
+        client.spreadsheet.add_worksheet.side_effect = _api_error(503)
+        with pytest.raises(gspread.exceptions.APIError):
+            client._ensure_listings_tab()
+        client.spreadsheet.add_worksheet.assert_called_once()
+
+
+class TestAddListings:
+    def test_single_read_and_append(self):
+        client, ws = _client_with_listings_tab(["1"])
+        props = [_make_property(zpid=z) for z in ("1", "2", "3", "2")]
+        assert client.add_listings(props) == [False, True, True, False]
+        ws.col_values.assert_called_once()
+        ws.append_rows.assert_called_once()
+        rows = ws.append_rows.call_args.args[0]
+        assert [r[LISTINGS_HEADERS.index("ZPID")] for r in rows] == ["2", "3"]
+
+    def test_zpid_cache_updated_after_append(self):
+        client, ws = _client_with_listings_tab([])
+        assert client.add_listing(_make_property(zpid="7")) is True
+        assert client.add_listing(_make_property(zpid="7")) is False
+        ws.col_values.assert_called_once()
+        ws.append_rows.assert_called_once()
+
+    def test_refresh_rereads_sheet(self):
+        client, ws = _client_with_listings_tab(["1"])
+        assert client.get_existing_zpids() == {"1"}
+        ws.col_values.return_value = ["ZPID", "1", "2"]
+        assert client.get_existing_zpids() == {"1"}
+        assert client.refresh_zpid_cache() == {"1", "2"}
+        assert ws.col_values.call_count == 2
+
+    def test_read_failure_not_cached(self):
+        client, ws = _client_with_listings_tab([])
+        ws.col_values.side_effect = [RuntimeError("quota"), ["ZPID", "5"]]
+        assert client.get_existing_zpids() == set()
+        assert client.get_existing_zpids() == {"5"}
+
+    def test_all_duplicates_no_write(self):
+        client, ws = _client_with_listings_tab(["1"])
+        assert client.add_listings([_make_property(zpid="1")]) == [False]
+        ws.append_rows.assert_not_called()
+
+
+class TestReadAllListings:
+    def test_round_trip(self):
+        client, ws = _client_with_listings_tab([])
+        prop = _make_property(status="Needs Work")
+        row = build_listing_row(prop)
+        row[LISTINGS_HEADERS.index("Status")] = "Needs Work"
+        ws.get_all_values.return_value = [LISTINGS_HEADERS, row]
+        (read,) = client.read_all_listings()
+        assert read.zpid == prop.zpid
+        assert read.price == prop.price
+        assert read.commute_minutes == prop.commute_minutes
+        assert (read.has_garage, read.has_basement, read.has_fireplace) == (True, False, None)
+        assert read.status == "Needs Work"
+        ws.get_all_values.assert_called_once_with(value_render_option="UNFORMATTED_VALUE")
+
+    def test_round_trip_every_field(self):
+        client, ws = _client_with_listings_tab([])
+        prop = Property(
+            zpid="9", address="1 A St, Town, NH", town="Town", price=1, bedrooms=2,
+            bathrooms=3.5, sqft=4, lot_size_acres=5.5, year_built=6, hoa_monthly=7,
+            has_garage=True, has_basement=False, has_fireplace=None,
+            property_type="Single Family", listing_url="https://z/9",
+            last_sale_price=8, last_sale_date="2020-01-01", county="County",
+            latitude=9.5, longitude=10.5, has_pool=True, has_cooling=False,
+            has_heating=True, garage_spaces=11, floor_count=12, room_count=13,
+            foundation_type="Slab", exterior_type="Vinyl", roof_type="Asphalt",
+            property_tax=14, tax_assessment=15, commute_minutes={"Work": 16},
+            status="Needs Work",
+        )
+        row = build_listing_row(prop)
+        row[LISTINGS_HEADERS.index("Status")] = "Needs Work"
+        ws.get_all_values.return_value = [LISTINGS_HEADERS, row]
+        assert client.read_all_listings() == [prop]
+
+    def test_short_row_uses_defaults(self):
+        client, ws = _client_with_listings_tab([])
+        ws.get_all_values.return_value = [LISTINGS_HEADERS, ["https://z/1", "2024-01-01", "", "1"]]
+        (read,) = client.read_all_listings()
+        assert read.zpid == "1"
+        assert read.price == 0
+
+    def test_long_row_missing_column_uses_default(self):
+        client, ws = _client_with_listings_tab([])
+        header = [h for h in LISTINGS_HEADERS if h != "Listing Price"]
+        row = build_listing_row(_make_property())
+        del row[LISTINGS_HEADERS.index("Listing Price")]
+        ws.get_all_values.return_value = [header, row + ["450000"]]
+        (read,) = client.read_all_listings()
+        assert read.zpid == _make_property().zpid
+        assert read.price == 0
+
+    def test_skip_statuses(self):
+        client, ws = _client_with_listings_tab([])
+        rows = [build_listing_row(_make_property(zpid=z)) for z in ("1", "2", "3")]
+        rows[1][LISTINGS_HEADERS.index("Status")] = "Ignore"
+        ws.get_all_values.return_value = [LISTINGS_HEADERS, *rows]
+        assert [p.zpid for p in client.read_all_listings(skip_statuses=("ignore",))] == ["1", "3"]
+        assert len(client.read_all_listings()) == 3
+
+    def test_empty_sheet(self):
+        client, ws = _client_with_listings_tab([])
+        ws.get_all_values.return_value = []
+        assert client.read_all_listings() == []
+
+
+class TestChangedRowRuns:
+    def test_identical_rows(self):
+        rows = [["Value Ratio", "Score"], [16.5, 50.0]]
+        assert _changed_row_runs([["Value Ratio", "Score"], [16.5, 50]], rows) == []
+
+    def test_contiguous_changes_coalesced(self):
+        existing = [["h"], [1], [2], [3], [4]]
+        rows = [["h"], [1], [9], [9], [4], [5]]
+        assert _changed_row_runs(existing, rows) == [(2, 4), (5, 6)]
+
+    def test_trailing_blank_cells_ignored(self):
+        assert _changed_row_runs([["a", "b", ""]], [["a", "b"]]) == []
+
+
+class TestColLetter:
+    def test_letters(self):
+        assert [_col_letter(n) for n in (1, 26, 27, 52, 702, 703)] == ["A", "Z", "AA", "AZ", "ZZ", "AAA"]
+
+
+class TestRebuildScores:
+    def _scored(self) -> list:
+        return [
+            (_make_property(zpid="1", price=200000), _breakdown(25.0)),
+            (_make_property(zpid="2", price=400000), _breakdown(12.5)),
+        ]
+
+    def _current_rows(self, scored) -> list[list]:
+        """Rows as the sheet would return them after a full rebuild of `scored`."""
+        client, _ = _client_with_scores_tab([])
+        client.rebuild_scores(scored)
+        write = _requests(client, "updateCells")[1]["updateCells"]
+        return [
+            [next(iter(c["userEnteredValue"].values())) if c else "" for c in row["values"]]
+            for row in write["rows"]
+        ]
+
+    def test_full_rebuild_on_empty_tab(self):
+        client, ws = _client_with_scores_tab([])
+        client.rebuild_scores(self._scored())
+        client.spreadsheet.batch_update.assert_called_once()
+        clear, write = _requests(client, "updateCells")
+        assert "rows" not in clear["updateCells"]
+        rows = write["updateCells"]["rows"]
+        assert rows[0]["values"][0] == {"userEnteredValue": {"stringValue": "Value Ratio"}}
+        assert len(rows) == 3
+        assert len(_requests(client, "repeatCell")) == 3  # bold header + 2 tiers
+        ws.clear.assert_not_called()
+        ws.update.assert_not_called()
+
+    def test_unchanged_tab_not_rewritten(self):
+        scored = self._scored()
+        client, _ = _client_with_scores_tab(self._current_rows(scored))
+        client.rebuild_scores(scored)
+        client.spreadsheet.batch_update.assert_not_called()
+
+    def test_tab_from_construction_used_once(self):
+        client, ws = _client_with_scores_tab([])
+        client._tabs = {"Scores": ws}
+        client.rebuild_scores([], commute_labels=[])
+        client.spreadsheet.worksheet.assert_not_called()
+        client.rebuild_scores([], commute_labels=[])
+        client.spreadsheet.worksheet.assert_called_once_with("Scores")
+
+    def test_only_changed_rows_written(self):
+        scored = self._scored()
+        existing = self._current_rows(scored)
+        scored[1] = (scored[1][0], _breakdown(13.0))
+        client, _ = _client_with_scores_tab(existing)
+        client.rebuild_scores(scored)
+        (write,) = _requests(client, "updateCells")
+        assert write["updateCells"]["start"]["rowIndex"] == 2
+        (row,) = write["updateCells"]["rows"]
+        assert row["values"][0] == {"userEnteredValue": {"numberValue": 13.0}}
+
+    def test_stale_rows_cleared(self):
+        scored = self._scored()
+        existing = self._current_rows(scored)
+        client, _ = _client_with_scores_tab(existing)
+        client.rebuild_scores(scored[:1])
+        (clear,) = _requests(client, "updateCells")
+        assert clear["updateCells"]["range"] == {"sheetId": 7, "startRowIndex": 2, "endRowIndex": 3}
+
+    def test_grid_grown_before_writing(self):
+        client, ws = _client_with_scores_tab([])
+        ws.row_count, ws.col_count = 2, 10
+        client.rebuild_scores(self._scored())
+        grow = _requests(client, "appendDimension")
+        assert [g["appendDimension"]["dimension"] for g in grow] == ["ROWS", "COLUMNS"]
+        assert [g["appendDimension"]["length"] for g in grow] == [1, 4]
+
+
+class TestTierColorRequests:
+    def _rows(self, n: int) -> list[tuple[int, int]]:
+        return [
+            (r["repeatCell"]["range"]["startRowIndex"], r["repeatCell"]["range"]["endRowIndex"])
+            for r in _tier_color_requests(0, n, 14)
+        ]
+
+    def test_one_range_per_tier(self):
+        assert self._rows(9) == [(1, 4), (4, 7), (7, 10)]
+
+    def test_single_row_stays_in_bounds(self):
+        assert self._rows(1) == [(1, 2)]
+
+    def test_two_rows(self):
+        assert self._rows(2) == [(1, 2), (2, 3)]
+
+    def test_no_rows(self):
+        assert _tier_color_requests(0, 0, 14) == []
+
+
+def _api_error(code: int, retry_after: str | None = None) -> gspread.exceptions.APIError:
+    response = MagicMock()
+    response.json.return_value = {"error": {"code": code, "message": "boom", "status": ""}}
+    response.headers = {"Retry-After": retry_after} if retry_after else {}
+    return gspread.exceptions.APIError(response)
+
+
+@patch("src.sheets.time.sleep")
+class TestWithRetry:
+    def test_retries_rate_limit_then_succeeds(self, sleep):
+        fn = MagicMock(side_effect=[_api_error(429), _api_error(503), "ok"])
+        assert _with_retry(fn, "A1", value_input_option="RAW") == "ok"
+        assert fn.call_count == 3
+        fn.assert_called_with("A1", value_input_option="RAW")
+        assert sleep.call_count == 2
+
+    def test_other_errors_raise_immediately(self, sleep):
+        fn = MagicMock(side_effect=_api_error(400))
+        with pytest.raises(gspread.exceptions.APIError):
+            _with_retry(fn)
+        fn.assert_called_once()
+        sleep.assert_not_called()
+
+    def test_honors_retry_after(self, sleep):
+        fn = MagicMock(side_effect=[_api_error(429, retry_after="7"), "ok"])
+        _with_retry(fn)
+        sleep.assert_called_once_with(7.0)
+
+    def test_gives_up_after_last_attempt(self, sleep):
+        fn = MagicMock(side_effect=_api_error(500))
+        with pytest.raises(gspread.exceptions.APIError):
+            _with_retry(fn)
+        assert fn.call_count == 6
+
+    def test_restricted_statuses(self, sleep):
+        fn = MagicMock(side_effect=_api_error(500))
+        with pytest.raises(gspread.exceptions.APIError):
+            _with_retry(fn, retry_statuses=(429,))
+        fn.assert_called_once()